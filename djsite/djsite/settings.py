@@ -16,6 +16,8 @@ import os
 from dotenv import load_dotenv
 from datetime import timedelta
 
+from .database import parse_database_url
+
 # Загружаем переменные окружения из файла .env
 load_dotenv()
 
@@ -41,15 +43,35 @@ DEBUG = True
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',  # Аутентификация по токену
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'user_account.authentication.ProfileJWTAuthentication',  # JWT, профиль загружается вместе с пользователем
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         # 'rest_framework.permissions.AllowAny',
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    # Курсорная пагинация списков (?page_size= для изменения размера страницы)
+    'DEFAULT_PAGINATION_CLASS': 'user_account.pagination.ApiCursorPagination',
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', 50)),
+    # JSON на orjson (если он не установлен - стандартный модуль json)
+    'DEFAULT_RENDERER_CLASSES': [
+        'user_account.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'user_account.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 500))
+# Размер порции строк при потоковой выгрузке (/api/export/)
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+# Метрики запросов (/api/metrics/); SQL-запросы считаются для доли METRICS_SAMPLE_RATE запросов
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+METRICS_SAMPLE_RATE = float(os.getenv('METRICS_SAMPLE_RATE', 0.1))
+
 SIMPLE_JWT = {
      'ACCESS_TOKEN_LIFETIME': timedelta(minutes=1000),
      'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -80,6 +102,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'user_account.middleware.MetricsMiddleware',
+    'user_account.middleware.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -112,18 +136,61 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'djsite.wsgi.application'
+ASGI_APPLICATION = 'djsite.asgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# Адрес основной базы - DATABASE_URL (по умолчанию SQLite), реплики для чтения -
+# DATABASE_REPLICA_URL (djsite.database). Для PostgreSQL подключения постоянные
+# (DB_CONN_MAX_AGE секунд) или, при DB_POOL=1, берутся из пула psycopg -
+# при SERVER_MODE=asgi нужен именно пул: постоянные подключения привязаны к потоку
+
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 60))
+DB_POOL = {
+    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+    'timeout': int(os.getenv('DB_POOL_TIMEOUT', 10)),
+} if os.getenv('DB_POOL') == '1' else None
 
 DATABASES = {
+    'default': parse_database_url(
+        os.getenv('DATABASE_URL', 'sqlite:///db.sqlite3'), BASE_DIR, DB_CONN_MAX_AGE, DB_POOL,
+    ),
+}
+
+if os.getenv('DATABASE_REPLICA_URL'):
+    DATABASES['replica'] = parse_database_url(
+        os.getenv('DATABASE_REPLICA_URL'), BASE_DIR, DB_CONN_MAX_AGE, DB_POOL,
+    )
+    # В тестах реплика - то же подключение, что и основная база
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+# Чтение представлений с replica_methods (user_account.routers) направляется в реплику
+DATABASE_ROUTERS = ['user_account.routers.ReplicaRouter']
+
+
+# Cache
+# Кеш ответов API (user_account.cache): в памяти процесса по умолчанию,
+# Redis при заданной переменной окружения REDIS_URL
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'event-planner',
     }
 }
 
+if os.getenv('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL'),
+    }
+
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 300))
+# Без общего кеша (Redis) инвалидация не доходит до других процессов, поэтому кеш ответов выключен
+API_CACHE_ENABLED = os.getenv('API_CACHE_ENABLED', '1' if os.getenv('REDIS_URL') else '0') == '1'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -195,37 +262,55 @@ CORS_ALLOWED_ORIGINS = [
 STATIC_URL = '/static/'
 STATIC_ROOT = '/static/'    
 
+# Логирование через очередь: запись в файл и консоль выполняет отдельный поток.
+# Файл - JSON по строке на запись; в него пишут все процессы, поэтому ротация
+# внешняя (logrotate). При пустом LOG_FILE записи идут только в stdout
+# (LOG_CONSOLE_JSON=1 - в формате JSON). Пароли и токены маскируются,
+# сообщения длиннее LOG_MAX_LENGTH обрезаются, записи ниже WARNING логгеров
+# приложения можно выборочно отбрасывать (LOG_SAMPLE_RATE)
+LOG_FILE = os.getenv('LOG_FILE', 'debug.log')
+LOG_CONSOLE_JSON = os.getenv('LOG_CONSOLE_JSON') == '1'
+LOG_MAX_LENGTH = int(os.getenv('LOG_MAX_LENGTH', 2000))
+LOG_SAMPLE_RATE = float(os.getenv('LOG_SAMPLE_RATE', 1))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
-    'formatters': {
-        'verbose': {
-            'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
-            'style': '{',
+    'filters': {
+        'sample': {
+            '()': 'user_account.log.SamplingFilter',
+            'rates': {'user_account': LOG_SAMPLE_RATE, 'project': LOG_SAMPLE_RATE},
+        },
+        'redact': {
+            '()': 'user_account.log.RedactingFilter',
+            'max_length': LOG_MAX_LENGTH,
         },
     },
     'handlers': {
-        'console': {
-            'class': 'logging.StreamHandler',
-            'formatter': 'verbose',
-        },
-        'file': {
-            'class': 'logging.FileHandler',
-            'filename': 'debug.log',
-            'formatter': 'verbose',
+        'queue': {
+            'class': 'user_account.log.QueueListenerHandler',
+            'filename': LOG_FILE,
+            'console': True,
+            'console_json': LOG_CONSOLE_JSON,
+            'filters': ['sample', 'redact'],
         },
     },
     'loggers': {
         'django': {
-            'handlers': ['console', 'file'],
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': True,
         },
         'user_account': {
-            'handlers': ['console', 'file'],
+            'handlers': ['queue'],
             'level': 'DEBUG',
             'propagate': True,
         },
+        'project': {
+            'handlers': ['queue'],
+            'level': 'INFO',
+            'propagate': True,
+        },
     },
 }
 
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Project, ProjectFile
+from .models import Project, ProjectFile, DocumentJob
 
 class ProjectFileInline(admin.TabularInline):
     model = ProjectFile
@@ -12,4 +12,9 @@ class ProjectAdmin(admin.ModelAdmin):
 
 @admin.register(ProjectFile)
 class ProjectFileAdmin(admin.ModelAdmin):
-    list_display = ('project', 'file_type', 'file_url', 'created_at')
\ No newline at end of file
+    list_display = ('project', 'file_type', 'file_url', 'created_at')
+
+@admin.register(DocumentJob)
+class DocumentJobAdmin(admin.ModelAdmin):
+    list_display = ('title', 'doc_type', 'status', 'attempts', 'updated_at')
+    list_filter = ('status', 'doc_type')
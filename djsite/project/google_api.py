@@ -1,14 +1,14 @@
+import logging
 import os
-import pickle
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+import threading
 from django.conf import settings
-from google.oauth2 import service_account
 from googleapiclient.errors import HttpError
 
-CLIENT_SECRETS_FILE = os.path.join(settings.BASE_DIR, "client_secret.json")
+logger = logging.getLogger(__name__)
+
+CLIENT_SECRETS_FILE = getattr(
+    settings, 'GOOGLE_SERVICE_ACCOUNT_FILE', os.path.join(settings.BASE_DIR, "client_secret.json")
+)
 SCOPES = [
     'https://www.googleapis.com/auth/drive',
     'https://www.googleapis.com/auth/forms.body',
@@ -16,12 +16,101 @@ SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets',
     'https://www.googleapis.com/auth/presentations',
 ]
-credentials = service_account.Credentials.from_service_account_file(
-    CLIENT_SECRETS_FILE, scopes=SCOPES
-)
+
+# Учетные данные сервисного аккаунта загружаются при первом обращении к Google API,
+# а не при импорте модуля: импорт project.views не читает файл ключа и не грузит криптографию.
+_credentials = None
+_credentials_lock = threading.Lock()
+
+# Реестр клиентов Google API на процесс: (api, версия) -> объект сервиса.
+# Клиент строится один раз из discovery-документа, поставляемого вместе с
+# google-api-python-client (static_discovery), без загрузки его по сети.
+_services = {}
+_services_lock = threading.Lock()
+# httplib2.Http не потокобезопасен, поэтому HTTP-соединение у каждого потока свое
+_thread_local = threading.local()
+
+def _reset_after_fork():
+    """
+    Сбрасывает состояние в дочернем процессе после fork (например, в воркере gunicorn
+    с --preload): соединения и блокировки родителя в потомке использовать нельзя.
+    """
+    global _credentials, _credentials_lock, _services, _services_lock, _thread_local
+    _credentials = None
+    _credentials_lock = threading.Lock()
+    _services = {}
+    _services_lock = threading.Lock()
+    _thread_local = threading.local()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def get_credentials():
+    """
+    Возвращает общие для процесса учетные данные сервисного аккаунта.
+
+    Файл ключа читается один раз; токен доступа переиспользуется всеми вызовами
+    и обновляется централизованно под блокировкой, когда истекает.
+    """
+    global _credentials
+    credentials = _credentials
+    if credentials is None or not credentials.valid:
+        with _credentials_lock:
+            if _credentials is None:
+                from google.oauth2 import service_account
+                _credentials = service_account.Credentials.from_service_account_file(
+                    CLIENT_SECRETS_FILE, scopes=SCOPES
+                )
+            if not _credentials.valid:
+                from google.auth.transport.requests import Request
+                _credentials.refresh(Request())
+            credentials = _credentials
+    return credentials
+
+def get_http():
+    """
+    Возвращает авторизованное HTTP-соединение текущего потока.
+    """
+    from google_auth_httplib2 import AuthorizedHttp
+    import httplib2
+
+    credentials = get_credentials()
+    http = getattr(_thread_local, 'http', None)
+    if http is None or http.credentials is not credentials:
+        http = AuthorizedHttp(credentials, http=httplib2.Http())
+        _thread_local.http = http
+    return http
+
+def _build_request(http, *args, **kwargs):
+    from googleapiclient.http import HttpRequest
+
+    # Запросы общих клиентов выполняются через соединение текущего потока
+    return HttpRequest(get_http(), *args, **kwargs)
+
+def get_service(api_name, api_version):
+    """
+    Возвращает закешированный клиент Google API, создавая его при первом обращении.
+    Потокобезопасно: клиент разделяется между потоками воркера.
+    """
+    key = (api_name, api_version)
+    service = _services.get(key)
+    if service is None:
+        with _services_lock:
+            service = _services.get(key)
+            if service is None:
+                from googleapiclient.discovery import build
+                service = build(
+                    api_name, api_version,
+                    credentials=get_credentials(),
+                    requestBuilder=_build_request,
+                    static_discovery=True,
+                    cache_discovery=False,
+                )
+                _services[key] = service
+    return service
 
 def make_file_public(file_id):
-    drive_service = build('drive', 'v3', credentials=credentials)
+    drive_service = get_service('drive', 'v3')
 
     permission = {
         'type': 'anyone',   # Доступ для всех
@@ -36,31 +125,9 @@ def make_file_public(file_id):
         print(f"Доступ открыт для всех: https://drive.google.com/file/d/{file_id}/view")
     except HttpError as error:
         print(f"Ошибка при изменении прав доступа: {error}")
-'''
-def authenticate_google():
-    creds = None
-    token_path = os.path.join(settings.BASE_DIR, 'token.pickle')
-
-    if os.path.exists(token_path):
-        with open(token_path, 'rb') as token:
-            creds = pickle.load(token)
-
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())else:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                CLIENT_SECRETS_FILE, SCOPES
-            )
-            creds = flow.run_local_server(port=0)
-        with open(token_path, 'wb') as token:
-            pickle.dump(creds, token)
-
-    return creds
-'''
+
 def create_google_doc(title):
-    global credentials
-    #creds = authenticate_google()
-    service = build('docs', 'v1', credentials=credentials)
+    service = get_service('docs', 'v1')
     document = {'title': title}
     doc = service.documents().create(body=document).execute()
     doc_id = doc.get('documentId')
@@ -68,9 +135,7 @@ def create_google_doc(title):
     return doc_id
 
 def create_google_sheet(title):
-    global credentials
-    #creds = authenticate_google()
-    service = build('sheets', 'v4', credentials=credentials)
+    service = get_service('sheets', 'v4')
     spreadsheet = {'properties': {'title': title}}
     sheet = service.spreadsheets().create(body=spreadsheet).execute()
     sheet_id = sheet.get('spreadsheetId')
@@ -78,9 +143,7 @@ def create_google_sheet(title):
     return sheet_id
 
 def create_google_slides(title):
-    global credentials
-    #creds = authenticate_google()
-    service = build('slides', 'v1', credentials=credentials)
+    service = get_service('slides', 'v1')
     presentation = {'title': title}
     slide = service.presentations().create(body=presentation).execute()
     slides_id = slide.get('presentationId')
@@ -88,9 +151,7 @@ def create_google_slides(title):
     return slides_id
 
 def create_google_form(title):
-    global credentials
-    #creds = authenticate_google()
-    service = build('forms', 'v1', credentials=credentials)
+    service = get_service('forms', 'v1')
     form = {'info': {'title': title}}
     form_result = service.forms().create(body=form).execute()
     form_id = form_result.get('formId')
@@ -98,11 +159,137 @@ def create_google_form(title):
     return form_id
 
 def delete_google_file(file_id):
-    global credentials
-    drive_service = build('drive', 'v3', credentials=credentials)
+    drive_service = get_service('drive', 'v3')
     try:
         drive_service.files().delete(fileId=file_id).execute()
         return True
     except HttpError as error:
         print(f"Ошибка при удалении файла: {error}")
-        return False
\ No newline at end of file
+        return False
+
+# Поддерживаемые типы документов: функция создания, тип файла для ProjectFile и шаблон ссылки
+GOOGLE_DOCUMENT_TYPES = {
+    'doc': (create_google_doc, 'Документ', 'https://docs.google.com/document/d/{}/edit'),
+    'sheet': (create_google_sheet, 'Таблица', 'https://docs.google.com/spreadsheets/d/{}/edit'),
+    'slide': (create_google_slides, 'Презентация', 'https://docs.google.com/presentation/d/{}/edit'),
+    'form': (create_google_form, 'Форма', 'https://docs.google.com/forms/d/{}/edit'),
+}
+
+def create_document(doc_type, title):
+    """
+    Создает документ Google Workspace указанного типа и возвращает его ID.
+    """
+    create, _, _ = GOOGLE_DOCUMENT_TYPES[doc_type]
+    return create(title)
+
+def document_url(doc_type, file_id):
+    _, _, url_template = GOOGLE_DOCUMENT_TYPES[doc_type]
+    return url_template.format(file_id)
+
+
+# Google принимает не более 100 вызовов в одном batch-запросе
+BATCH_LIMIT = 100
+
+# Построение запроса на создание документа: (api, версия), фабрика запроса и поле с ID в ответе
+_CREATE_REQUESTS = {
+    'doc': (('docs', 'v1'), lambda service, title: service.documents().create(body={'title': title}), 'documentId'),
+    'sheet': (('sheets', 'v4'), lambda service, title: service.spreadsheets().create(body={'properties': {'title': title}}), 'spreadsheetId'),
+    'slide': (('slides', 'v1'), lambda service, title: service.presentations().create(body={'title': title}), 'presentationId'),
+    'form': (('forms', 'v1'), lambda service, title: service.forms().create(body={'info': {'title': title}}), 'formId'),
+}
+
+def execute_batch(service, requests):
+    """
+    Выполняет запросы одного API через HTTP batch, по BATCH_LIMIT вызовов за round trip.
+
+    Args:
+        service: Клиент Google API, к которому относятся запросы
+        requests: Список пар (ключ, HttpRequest)
+
+    Returns:
+        dict: ключ -> (ответ, исключение); ровно одно из значений не None
+    """
+    keys = {}
+    results = {}
+
+    def callback(request_id, response, exception):
+        results[keys[request_id]] = (response, exception)
+
+    for start in range(0, len(requests), BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=callback)
+        for index, (key, request) in enumerate(requests[start:start + BATCH_LIMIT], start=start):
+            keys[str(index)] = key
+            batch.add(request, request_id=str(index))
+        batch.execute(http=get_http())
+    return results
+
+def make_files_public(file_ids):
+    """
+    Открывает доступ к нескольким файлам одним batch-запросом к Drive API.
+
+    Returns:
+        dict: ID файла -> текст ошибки или None
+    """
+    drive_service = get_service('drive', 'v3')
+    permission = {'type': 'anyone', 'role': 'writer'}
+    requests = [
+        (file_id, drive_service.permissions().create(fileId=file_id, body=permission))
+        for file_id in file_ids
+    ]
+    results = execute_batch(drive_service, requests)
+    return {file_id: str(error) if error else None for file_id, (_, error) in results.items()}
+
+def create_documents(items):
+    """
+    Создает несколько документов batch-запросами: по одному на каждый API
+    и один общий на открытие доступа в Drive.
+
+    Args:
+        items: Список троек (ключ, doc_type, title)
+
+    Returns:
+        dict: ключ -> (ID файла, текст ошибки); ровно одно из значений не None
+    """
+    results = {}
+    by_api = {}
+    for key, doc_type, title in items:
+        api, build_request, id_field = _CREATE_REQUESTS[doc_type]
+        by_api.setdefault(api, []).append((key, title, build_request, id_field))
+
+    created = {}
+    for (api_name, api_version), api_items in by_api.items():
+        service = get_service(api_name, api_version)
+        requests = [(key, build_request(service, title)) for key, title, build_request, _ in api_items]
+        responses = execute_batch(service, requests)
+        for key, _, _, id_field in api_items:
+            response, error = responses[key]
+            if error:
+                results[key] = (None, str(error))
+            else:
+                created[key] = response.get(id_field)
+
+    errors = make_files_public(list(created.values())) if created else {}
+    for key, file_id in created.items():
+        # Документ создан, даже если открыть доступ не удалось
+        if errors.get(file_id):
+            logger.warning('Не удалось открыть доступ к файлу %s: %s', file_id, errors[file_id])
+        results[key] = (file_id, None)
+    return results
+
+def delete_google_files(file_ids):
+    """
+    Удаляет несколько файлов из Google Drive batch-запросами.
+    Уже отсутствующий файл (404) считается удаленным.
+
+    Returns:
+        dict: ID файла -> текст ошибки или None
+    """
+    drive_service = get_service('drive', 'v3')
+    requests = [(file_id, drive_service.files().delete(fileId=file_id)) for file_id in file_ids]
+    results = execute_batch(drive_service, requests)
+    errors = {}
+    for file_id, (_, error) in results.items():
+        if error is not None and getattr(getattr(error, 'resp', None), 'status', None) == 404:
+            error = None
+        errors[file_id] = str(error) if error else None
+    return errors
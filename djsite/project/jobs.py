@@ -0,0 +1,178 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import google_api
+from .models import DocumentJob, ProjectFile
+from .signals import invalidate_projects
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = getattr(settings, 'DOCUMENT_JOB_MAX_ATTEMPTS', 3)
+# Задачи в состоянии running дольше этого времени считаются брошенными упавшим воркером
+RUNNING_TIMEOUT = getattr(settings, 'DOCUMENT_JOB_RUNNING_TIMEOUT', timedelta(minutes=10))
+
+
+def enqueue_document(project, doc_type, title, file_name=None):
+    """
+    Ставит создание документа Google Workspace в очередь.
+
+    Сразу создает ProjectFile в состоянии pending и связанную с ним DocumentJob.
+
+    Args:
+        project: Проект, к которому добавляется документ
+        doc_type: Тип документа из google_api.GOOGLE_DOCUMENT_TYPES
+        title: Название документа
+        file_name: Отображаемое имя файла (по умолчанию - title)
+
+    Returns:
+        DocumentJob: Созданная задача
+    """
+    _, file_type, _ = google_api.GOOGLE_DOCUMENT_TYPES[doc_type]
+    with transaction.atomic():
+        project_file = ProjectFile.objects.create(
+            project=project,
+            file_type=file_type,
+            file_name=file_name or title,
+            status=ProjectFile.STATUS_PENDING,
+        )
+        return DocumentJob.objects.create(project_file=project_file, doc_type=doc_type, title=title)
+
+
+def enqueue_documents(project, items):
+    """
+    Ставит в очередь создание нескольких документов двумя INSERT-запросами.
+
+    Args:
+        project: Проект, к которому добавляются документы
+        items: Список троек (doc_type, title, file_name)
+
+    Returns:
+        list: Созданные задачи в порядке items
+    """
+    with transaction.atomic():
+        files = ProjectFile.objects.bulk_create([
+            ProjectFile(
+                project=project,
+                file_type=google_api.GOOGLE_DOCUMENT_TYPES[doc_type][1],
+                file_name=file_name or title,
+                status=ProjectFile.STATUS_PENDING,
+            )
+            for doc_type, title, file_name in items
+        ])
+        jobs = DocumentJob.objects.bulk_create([
+            DocumentJob(project_file=project_file, doc_type=doc_type, title=title)
+            for project_file, (doc_type, title, _) in zip(files, items)
+        ])
+        invalidate_projects([project.pk])
+        return jobs
+
+
+def requeue_stale_jobs():
+    """
+    Возвращает в очередь задачи, зависшие в состоянии running.
+    """
+    deadline = timezone.now() - RUNNING_TIMEOUT
+    return DocumentJob.objects.filter(status=DocumentJob.STATUS_RUNNING, updated_at__lt=deadline).update(
+        status=DocumentJob.STATUS_PENDING, updated_at=timezone.now()
+    )
+
+
+def claim_jobs(limit):
+    """
+    Забирает до limit задач из очереди.
+
+    Каждая задача переводится в running условным UPDATE, поэтому несколько
+    воркеров могут работать с очередью одновременно, не выполняя задачу дважды.
+    """
+    claimed = []
+    candidates = (
+        DocumentJob.objects.filter(status=DocumentJob.STATUS_PENDING)
+        .select_related('project_file')
+        .order_by('id')[:limit]
+    )
+    for job in candidates:
+        updated = DocumentJob.objects.filter(pk=job.pk, status=DocumentJob.STATUS_PENDING).update(
+            status=DocumentJob.STATUS_RUNNING, updated_at=timezone.now()
+        )
+        if updated:
+            job.status = DocumentJob.STATUS_RUNNING
+            claimed.append(job)
+    return claimed
+
+
+def finish_job(job, file_id=None, error=None, client=google_api):
+    """
+    Сохраняет результат выполнения задачи.
+
+    При успехе заполняет ссылку на документ в ProjectFile, при ошибке
+    возвращает задачу в очередь или, после MAX_ATTEMPTS попыток, помечает
+    задачу и файл как failed.
+
+    Returns:
+        bool: True, если документ создан
+    """
+    attempts = job.attempts + 1
+    if error is not None:
+        logger.error(f'Ошибка создания документа для задачи {job.pk}: {error}')
+        failed = attempts >= MAX_ATTEMPTS
+        job_status = DocumentJob.STATUS_FAILED if failed else DocumentJob.STATUS_PENDING
+        DocumentJob.objects.filter(pk=job.pk).update(
+            status=job_status, attempts=attempts, error=error, updated_at=timezone.now()
+        )
+        if failed:
+            ProjectFile.objects.filter(pk=job.project_file_id).update(status=ProjectFile.STATUS_FAILED)
+            invalidate_projects([job.project_file.project_id])
+        job.status, job.attempts, job.error = job_status, attempts, error
+        return False
+
+    # Обновляем через filter().update(), чтобы не воссоздать файл, удаленный во время выполнения задачи
+    with transaction.atomic():
+        ProjectFile.objects.filter(pk=job.project_file_id).update(
+            file_url=client.document_url(job.doc_type, file_id),
+            status=ProjectFile.STATUS_READY,
+        )
+        DocumentJob.objects.filter(pk=job.pk).update(
+            status=DocumentJob.STATUS_DONE, attempts=attempts, error='', updated_at=timezone.now()
+        )
+        invalidate_projects([job.project_file.project_id])
+    job.status, job.attempts, job.error = DocumentJob.STATUS_DONE, attempts, ''
+    return True
+
+
+def run_jobs(jobs, client=google_api):
+    """
+    Выполняет задачи одним пакетом: документы создаются batch-запросами
+    через client.create_documents.
+
+    Args:
+        jobs: Задачи в состоянии running
+        client: Объект с методами create_documents(items) и
+            document_url(doc_type, file_id); по умолчанию - модуль google_api
+    """
+    if not jobs:
+        return
+    try:
+        results = client.create_documents([(job.pk, job.doc_type, job.title) for job in jobs])
+    except Exception as e:
+        logger.error(f'Ошибка пакетного создания документов: {e}', exc_info=True)
+        results = {job.pk: (None, str(e)) for job in jobs}
+    for job in jobs:
+        file_id, error = results.get(job.pk, (None, 'No result returned'))
+        finish_job(job, file_id=file_id, error=error, client=client)
+
+
+def run_pending_jobs(limit=10, client=google_api):
+    """
+    Выполняет очередную порцию задач из очереди.
+
+    Returns:
+        int: Количество обработанных задач
+    """
+    requeue_stale_jobs()
+    jobs = claim_jobs(limit)
+    run_jobs(jobs, client=client)
+    return len(jobs)
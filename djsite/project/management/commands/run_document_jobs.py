@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from project.jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи создания документов Google Workspace'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Обработать все задачи в очереди и завершиться')
+        parser.add_argument('--batch-size', type=int, default=50, help='Количество задач, забираемых за один проход')
+        parser.add_argument('--interval', type=float, default=2.0, help='Пауза между проходами при пустой очереди, сек')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_pending_jobs(limit=options['batch_size'])
+            if processed:
+                self.stdout.write(f'Обработано задач: {processed}')
+            if options['once']:
+                if not processed:
+                    break
+                continue
+            if not processed:
+                time.sleep(options['interval'])
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:04
+
+from django.db import migrations, models
+
+
+def fill_project_paths(apps, schema_editor):
+    Project = apps.get_model('project', 'Project')
+    children = {}
+    for pk, parent_id in Project.objects.values_list('pk', 'parent_project_id'):
+        children.setdefault(parent_id, []).append(pk)
+
+    updated = []
+    stack = [(pk, '/') for pk in children.get(None, [])]
+    while stack:
+        pk, parent_path = stack.pop()
+        path = f'{parent_path}{pk}/'
+        updated.append(Project(pk=pk, path=path, depth=path.count('/') - 2))
+        stack.extend((child, path) for child in children.get(pk, []))
+    Project.objects.bulk_update(updated, ['path', 'depth'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0004_alter_project_parent_project'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='depth',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Глубина в иерархии'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=1024, verbose_name='Путь в иерархии'),
+        ),
+        migrations.RunPython(fill_project_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0005_project_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectfile',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Создается'), ('ready', 'Готов'), ('failed', 'Ошибка')], default='ready', max_length=20, verbose_name='Состояние'),
+        ),
+        migrations.AlterField(
+            model_name='projectfile',
+            name='file_url',
+            field=models.URLField(blank=True, verbose_name='Ссылка на файл'),
+        ),
+        migrations.CreateModel(
+            name='DocumentJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('doc_type', models.CharField(max_length=20, verbose_name='Тип документа')),
+                ('title', models.CharField(max_length=255, verbose_name='Название документа')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('running', 'Выполняется'), ('done', 'Выполнена'), ('failed', 'Ошибка')], db_index=True, default='pending', max_length=20, verbose_name='Состояние')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попытки')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата изменения')),
+                ('project_file', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='job', to='project.projectfile', verbose_name='Файл проекта')),
+            ],
+        ),
+    ]
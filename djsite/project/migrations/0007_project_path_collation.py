@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-18 21:17
+
+import project.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0006_document_jobs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='path',
+            field=project.models.PathField(blank=True, db_index=True, editable=False, max_length=1024, verbose_name='Путь в иерархии'),
+        ),
+    ]
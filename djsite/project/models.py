@@ -1,4 +1,49 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery, Value, Func
+from django.db.models.functions import Concat, Left, Length, Substr
+
+
+class PathField(models.CharField):
+    """
+    Материализованный путь. Поддерево выбирается диапазоном [path, path_upper_bound),
+    что верно только при побайтовом сравнении строк ('/' < '0'). В PostgreSQL колонка
+    создается с collation "C" (правила сортировки локали игнорируют знаки препинания);
+    в SQLite сравнение и так побайтовое (BINARY), а collation "C" там не существует.
+    """
+    def db_parameters(self, connection):
+        params = super().db_parameters(connection)
+        if connection.vendor == 'postgresql' and not self.db_collation:
+            params['collation'] = 'C'
+        return params
+
+
+class ProjectQuerySet(models.QuerySet):
+    """
+    Набор запросов для проектов с поддержкой материализованного пути.
+    """
+    def descendants_of(self, project, max_depth=None):
+        """
+        Все потомки проекта одним запросом по диапазону индексированного пути.
+        """
+        queryset = self.filter(path__gt=project.path, path__lt=project.path_upper_bound)
+        if max_depth is not None:
+            queryset = queryset.filter(depth__lte=project.depth + max_depth)
+        return queryset
+
+    def with_descendant_count(self):
+        """
+        Аннотирует каждый проект числом его потомков (поле descendant_count).
+        """
+        upper_bound = Concat(Left(OuterRef('path'), Length(OuterRef('path')) - 1), Value('0'))
+        descendants = (
+            Project.objects
+            .filter(path__gt=OuterRef('path'), path__lt=upper_bound)
+            .order_by()
+            .annotate(count=Func(F('id'), function='COUNT'))
+            .values('count')
+        )
+        return self.annotate(descendant_count=Subquery(descendants, output_field=models.IntegerField()))
+
 
 class Project(models.Model):
     """
@@ -9,22 +54,172 @@ class Project(models.Model):
         description (TextField): Подробное описание проекта (опционально)
         created_at (DateTimeField): Дата и время создания проекта (автоматически)
         parent_project (ForeignKey): Связь с родительским проектом для создания иерархии проектов
+        path (CharField): Материализованный путь от корня иерархии вида '/1/5/9/' (поддерживается автоматически)
+        depth (PositiveIntegerField): Глубина проекта в иерархии, 0 для корневых проектов
     """
     title = models.CharField(max_length=255, verbose_name='Название проекта')
     description = models.TextField(blank=True, verbose_name='Описание проекта')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')
     parent_project = models.ForeignKey('self', null=True, blank=False, on_delete=models.CASCADE, related_name='sub_projects', verbose_name='Родительский проект')
+    path = PathField(max_length=1024, blank=True, db_index=True, editable=False, verbose_name='Путь в иерархии')
+    depth = models.PositiveIntegerField(default=0, editable=False, verbose_name='Глубина в иерархии')
+
+    objects = ProjectQuerySet.as_manager()
+
+    @property
+    def ancestor_ids(self):
+        """
+        Идентификаторы предков проекта от корня к непосредственному родителю.
+        """
+        return [int(part) for part in self.path.strip('/').split('/')[:-1] if part]
+
+    @property
+    def path_upper_bound(self):
+        # Все пути потомков лежат в диапазоне ('/1/5/', '/1/50'), т.к. '/' < '0'
+        return self.path[:-1] + '0'
+
+    def ancestors(self):
+        """
+        Предки проекта (для хлебных крошек) одним запросом, от корня к родителю.
+        """
+        return Project.objects.filter(pk__in=self.ancestor_ids).order_by('depth')
+
+    def descendants(self, max_depth=None):
+        """
+        Все потомки проекта одним запросом.
+        """
+        return Project.objects.descendants_of(self, max_depth=max_depth)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'parent_project' not in update_fields:
+            # Название выводится в ancestors потомков: обработчик сигнала сбросит их кеш
+            self._title_changed = 'title' in update_fields
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            # Актуальные пути и названия текущего проекта и нового родителя берем из БД одним запросом
+            rows = {
+                pk: (path, title) for pk, path, title in
+                Project.objects
+                .filter(pk__in=[pk for pk in (self.pk, self.parent_project_id) if pk])
+                .values_list('pk', 'path', 'title')
+            }
+            parent_path = rows.get(self.parent_project_id, ('/',))[0] if self.parent_project_id else '/'
+            if self.pk and f'/{self.pk}/' in parent_path:
+                raise ValueError('Проект нельзя переместить внутрь собственного поддерева.')
+            old_path, old_title = rows.get(self.pk, ('', self.title)) if self.pk else ('', self.title)
+            # Прежний путь, путь родителя и смена названия нужны обработчикам сигналов для инвалидации кеша
+            self._previous_path, self._parent_path = old_path, parent_path
+            self._title_changed = old_title != self.title
+
+            # Строка сохраняется с путем из БД, а не из экземпляра: экземпляр мог быть
+            # загружен до перемещения предка. Новый путь записывает только _move_subtree
+            self.path = old_path
+            self.depth = max(old_path.count('/') - 2, 0)
+            super().save(*args, **kwargs)
+            new_path = f'{parent_path}{self.pk}/'
+            if new_path != old_path:
+                self._move_subtree(old_path, new_path)
+        self.path = new_path
+        self.depth = new_path.count('/') - 2
+
+    def _move_subtree(self, old_path, new_path):
+        new_depth = new_path.count('/') - 2
+        Project.objects.filter(pk=self.pk).update(path=new_path, depth=new_depth)
+        if old_path:
+            # Переносим всех потомков набором из одного UPDATE, заменяя префикс пути
+            Project.objects.filter(path__gt=old_path, path__lt=old_path[:-1] + '0').update(
+                path=Concat(Value(new_path), Substr('path', len(old_path) + 1)),
+                depth=F('depth') + (new_depth - (old_path.count('/') - 2)),
+            )
+
+    def delete(self, *args, **kwargs):
+        if not self.path:
+            return super().delete(*args, **kwargs)
+        # Поддерево удаляется одним набором по префиксу пути, без обхода sub_projects по уровням
+        return Project.objects.filter(path__gte=self.path, path__lt=self.path_upper_bound).delete()
 
     def __str__(self):
         return self.title
+
     
 
 class ProjectFile(models.Model):
+    """
+    Файл (документ Google Workspace или внешняя ссылка), привязанный к проекту.
+
+    Attributes:
+        project (ForeignKey): Проект, к которому относится файл
+        file_type (CharField): Тип файла ('Документ', 'Таблица', 'Презентация', 'Форма', 'Ссылка')
+        file_url (URLField): Ссылка на файл (пустая, пока документ создается)
+        created_at (DateTimeField): Дата добавления
+        file_name (CharField): Отображаемое имя файла
+        status (CharField): Состояние файла (pending - создается, ready - готов, failed - ошибка создания)
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_READY = 'ready'
+    STATUS_FAILED = 'failed'
+    STATUS = [
+        (STATUS_PENDING, 'Создается'),
+        (STATUS_READY, 'Готов'),
+        (STATUS_FAILED, 'Ошибка'),
+    ]
+
     project = models.ForeignKey(Project, related_name='files', on_delete=models.CASCADE, verbose_name='Проект')
     file_type = models.CharField(max_length=50, verbose_name='Тип файла')
-    file_url = models.URLField(verbose_name='Ссылка на файл')
+    file_url = models.URLField(blank=True, verbose_name='Ссылка на файл')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата добавления')
     file_name = models.CharField(max_length=255, blank=True, null=True)
+    status = models.CharField(max_length=20, choices=STATUS, default=STATUS_READY, verbose_name='Состояние')
+
+    @property
+    def google_file_id(self):
+        """
+        ID документа в Google Drive или None для внешних ссылок и еще не созданных документов.
+        """
+        if self.file_type == 'Ссылка' or not self.file_url:
+            return None
+        return self.file_url.split('/')[-2]
+
+    def __str__(self):
+        return f"{self.file_type} для {self.project.title}"
+
+
+class DocumentJob(models.Model):
+    """
+    Фоновая задача создания документа Google Workspace.
+    Выполняется командой manage.py run_document_jobs.
+
+    Attributes:
+        project_file (OneToOneField): Файл проекта, который заполняется по завершении задачи
+        doc_type (CharField): Тип документа ('doc', 'sheet', 'slide', 'form')
+        title (CharField): Название создаваемого документа
+        status (CharField): Состояние задачи (pending, running, done, failed)
+        attempts (PositiveSmallIntegerField): Количество выполненных попыток
+        error (TextField): Текст последней ошибки
+        created_at (DateTimeField): Дата постановки в очередь
+        updated_at (DateTimeField): Дата последнего изменения состояния
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS = [
+        (STATUS_PENDING, 'В очереди'),
+        (STATUS_RUNNING, 'Выполняется'),
+        (STATUS_DONE, 'Выполнена'),
+        (STATUS_FAILED, 'Ошибка'),
+    ]
+
+    project_file = models.OneToOneField(ProjectFile, related_name='job', on_delete=models.CASCADE, verbose_name='Файл проекта')
+    doc_type = models.CharField(max_length=20, verbose_name='Тип документа')
+    title = models.CharField(max_length=255, verbose_name='Название документа')
+    status = models.CharField(max_length=20, choices=STATUS, default=STATUS_PENDING, db_index=True, verbose_name='Состояние')
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='Попытки')
+    error = models.TextField(blank=True, verbose_name='Ошибка')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Дата изменения')
 
     def __str__(self):
-        return f"{self.file_type} для {self.project.title}"
\ No newline at end of file
+        return f"{self.doc_type} '{self.title}' ({self.status})"
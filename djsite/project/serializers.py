@@ -1,15 +1,69 @@
 from rest_framework import serializers
-from .models import Project, ProjectFile
+from .models import Project, ProjectFile, DocumentJob
+from user_account.serializers import DynamicFieldsMixin, ValuesSerializerMixin
 
 class ProjectFileSerializer(serializers.ModelSerializer):
     class Meta:
         model = ProjectFile
         fields = '__all__'
 
-class ProjectSerializer(serializers.ModelSerializer):
+class DocumentJobSerializer(serializers.ModelSerializer):
+    file = ProjectFileSerializer(source='project_file', read_only=True)
+
+    class Meta:
+        model = DocumentJob
+        fields = ['id', 'doc_type', 'title', 'status', 'attempts', 'error', 'created_at', 'updated_at', 'file']
+
+class ProjectSerializer(DynamicFieldsMixin, ValuesSerializerMixin, serializers.ModelSerializer):
     files = ProjectFileSerializer(many=True, read_only=True)
     sub_projects = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    ancestors = serializers.SerializerMethodField(help_text="Предки проекта от корня к родителю")
+    descendant_count = serializers.SerializerMethodField(help_text="Количество всех потомков проекта")
 
     class Meta:
         model = Project
-        fields = '__all__'
+        # path и depth - служебный индекс иерархии, в API не выводятся
+        fields = [
+            'id', 'files', 'sub_projects', 'ancestors', 'descendant_count',
+            'title', 'description', 'created_at', 'parent_project',
+        ]
+        expandable_fields = ['description', 'files']
+
+    def get_ancestors(self, obj):
+        if not obj.ancestor_ids:
+            return []
+        return [{'id': project.id, 'title': project.title} for project in obj.ancestors()]
+
+    def get_descendant_count(self, obj):
+        if hasattr(obj, 'descendant_count'):
+            return obj.descendant_count
+        return obj.descendants().count()
+
+    def validate_parent_project(self, value):
+        if value and self.instance and (value.pk == self.instance.pk or f'/{self.instance.pk}/' in value.path):
+            raise serializers.ValidationError('Проект нельзя переместить внутрь собственного поддерева.')
+        return value
+
+class ProjectTreeSerializer(ProjectSerializer):
+    """
+    Сериализатор поддерева проектов с вложенными подпроектами и файлами.
+    Ожидает проекты, подготовленные build_project_trees (атрибут tree_children).
+    Предки выводятся только для корня поддерева.
+    """
+    sub_projects = serializers.SerializerMethodField()
+
+    def get_sub_projects(self, obj):
+        children = getattr(obj, 'tree_children', [])
+        context = {**self.context, 'tree_nested': True}
+        return ProjectTreeSerializer(children, many=True, context=context).data
+
+    def get_ancestors(self, obj):
+        if self.context.get('tree_nested'):
+            return None
+        return super().get_ancestors(obj)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if self.context.get('tree_nested'):
+            data.pop('ancestors', None)
+        return data
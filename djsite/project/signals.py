@@ -0,0 +1,47 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from user_account.cache import bump_version
+from .models import Project, ProjectFile
+
+
+def _path_ids(path):
+    return [int(part) for part in (path or '').strip('/').split('/') if part]
+
+
+def invalidate_projects(project_ids):
+    """
+    Инвалидирует закешированные ответы проектов и всех их предков
+    (у предков меняются descendant_count и поддерево), а также списка проектов.
+    Используется и там, где сигналы не отправляются (bulk_create, update()).
+    """
+    project_ids = set(project_ids)
+    paths = Project.objects.filter(pk__in=project_ids).values_list('path', flat=True)
+    for path in paths:
+        project_ids.update(_path_ids(path))
+    bump_version('project', project_ids)
+    bump_version('project_list')
+
+
+@receiver([post_save, post_delete], sender=Project)
+def invalidate_project(sender, instance, **kwargs):
+    previous_path = getattr(instance, '_previous_path', '')
+    parent_path = getattr(instance, '_parent_path', '')
+    if previous_path and previous_path != f'{parent_path}{instance.pk}/':
+        # Перемещение меняет ancestors у всего поддерева: сбрасываем все проекты
+        bump_version('project')
+    elif kwargs.get('signal') is post_save and getattr(instance, '_title_changed', False):
+        # Название проекта входит в ancestors всех потомков
+        bump_version('project', Project.objects.descendants_of(instance).values_list('pk', flat=True))
+    ids = {instance.pk, *_path_ids(instance.path), *_path_ids(previous_path), *_path_ids(parent_path)}
+    bump_version('project', ids)
+    bump_version('project_list')
+
+
+@receiver([post_save, post_delete], sender=ProjectFile)
+def invalidate_project_file(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, (Project, QuerySet)) and getattr(origin, 'model', type(origin)) is Project:
+        # Файл удаляется каскадно вместе с проектом, который сам сбросит свой кеш
+        return
+    invalidate_projects([instance.project_id])
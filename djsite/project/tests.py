@@ -1,3 +1,568 @@
-from django.test import TestCase
+"""
+Test ProjectTreeView
+Цель: Проверить получение иерархии проектов одним запросом
+Что проверяет:
+- Возвращает ли endpoint все вложенные подпроекты и их файлы
+- Ограничивает ли max_depth глубину поддерева
+- Не зависит ли число SQL-запросов от размера дерева
+"""
+
+import asyncio
+import threading
+from unittest import mock
+from django.urls import reverse
+from django.test import TestCase, TransactionTestCase, AsyncClient
+from google.auth.credentials import AnonymousCredentials
+from django.db import connection
+from django.core.cache import cache
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APITestCase
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from .models import Project, ProjectFile, DocumentJob
+from .jobs import run_pending_jobs
+from . import google_api
+from . import views
+
+
+class ProjectTreeTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='treeuser', password='testpass')
+        cls.root = Project.objects.create(title='Root')
+        cls.child = Project.objects.create(title='Child', parent_project=cls.root)
+        cls.grandchild = Project.objects.create(title='Grandchild', parent_project=cls.child)
+        ProjectFile.objects.create(
+            project=cls.grandchild,
+            file_type='Ссылка',
+            file_url='https://example.com/file',
+            file_name='File'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+
+    def test_tree_contains_nested_projects_and_files(self):
+        url = reverse('project_tree', kwargs={'pk': self.root.id})
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        child = response.data['sub_projects'][0]
+        self.assertEqual(child['id'], self.child.id)
+        grandchild = child['sub_projects'][0]
+        self.assertEqual(grandchild['id'], self.grandchild.id)
+        self.assertEqual(grandchild['files'][0]['file_name'], 'File')
+        self.assertEqual(grandchild['sub_projects'], [])
+
+    def test_tree_max_depth(self):
+        url = reverse('project_tree', kwargs={'pk': self.root.id}) + '?max_depth=1'
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['sub_projects'][0]['sub_projects'], [])
+
+    def test_tree_invalid_max_depth(self):
+        url = reverse('project_tree', kwargs={'pk': self.root.id}) + '?max_depth=-1'
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_tree_query_count_is_constant(self):
+        url = reverse('project_tree', kwargs={'pk': self.root.id})
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(url)
+
+        parent = self.grandchild
+        for i in range(5):
+            parent = Project.objects.create(title=f'Level {i}', parent_project=parent)
+            Project.objects.create(title=f'Leaf {i}', parent_project=parent)
+
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(small), len(large))
+
+    def test_project_list_tree_option(self):
+        response = self.client.get(reverse('project_list') + '?tree=1')
+
+        self.assertEqual(response.status_code, 200)
+        root = response.data['results'][0]
+        self.assertEqual(root['sub_projects'][0]['sub_projects'][0]['id'], self.grandchild.id)
+
+
+"""
+Test Project hierarchy index
+Цель: Проверить поддержку материализованного пути проектов
+Что проверяет:
+- Заполняются ли path и depth при создании подпроектов
+- Обновляются ли пути всего поддерева при перемещении проекта
+- Не возвращает ли сохранение экземпляра, загруженного до перемещения предка, прежний путь
+- Запрещено ли перемещение проекта внутрь собственного поддерева
+- Возвращаются ли ancestors и descendant_count через API, а служебные path и depth - нет
+- Удаляется ли все поддерево вместе с файлами
+- Создается ли колонка пути с побайтовым сравнением (collation "C") в PostgreSQL
+"""
+class ProjectHierarchyTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='hierarchy', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.root = Project.objects.create(title='Root')
+        self.child = Project.objects.create(title='Child', parent_project=self.root)
+        self.grandchild = Project.objects.create(title='Grandchild', parent_project=self.child)
+
+    def test_paths_are_maintained(self):
+        self.assertEqual(self.root.path, f'/{self.root.id}/')
+        self.assertEqual(self.grandchild.path, f'/{self.root.id}/{self.child.id}/{self.grandchild.id}/')
+        self.assertEqual(self.grandchild.depth, 2)
+        self.assertEqual(list(self.root.descendants().order_by('depth')), [self.child, self.grandchild])
+        self.assertEqual(list(self.grandchild.ancestors()), [self.root, self.child])
+
+    def test_move_updates_subtree(self):
+        other_root = Project.objects.create(title='Other root')
+        self.child.parent_project = other_root
+        self.child.save()
+
+        self.grandchild.refresh_from_db()
+        self.assertEqual(self.grandchild.path, f'/{other_root.id}/{self.child.id}/{self.grandchild.id}/')
+        self.assertEqual(self.grandchild.depth, 2)
+        self.assertEqual(self.root.descendants().count(), 0)
+
+    def test_save_stale_instance_after_move(self):
+        stale = Project.objects.get(pk=self.grandchild.pk)
+        other_root = Project.objects.create(title='Other root')
+        self.child.parent_project = other_root
+        self.child.save()
+
+        stale.title = 'Renamed'
+        stale.save()
+
+        expected = f'/{other_root.id}/{self.child.id}/{self.grandchild.id}/'
+        self.assertEqual(stale.path, expected)
+        self.grandchild.refresh_from_db()
+        self.assertEqual((self.grandchild.title, self.grandchild.path, self.grandchild.depth), ('Renamed', expected, 2))
+        self.assertEqual(list(other_root.descendants().order_by('depth')), [self.child, self.grandchild])
+
+    def test_cannot_move_into_own_subtree(self):
+        self.root.parent_project = self.grandchild
+        with self.assertRaises(ValueError):
+            self.root.save()
+
+    def test_detail_exposes_ancestors_and_descendant_count(self):
+        response = self.client.get(reverse('project_detail', kwargs={'pk': self.child.id}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['ancestors'], [{'id': self.root.id, 'title': 'Root'}])
+        self.assertEqual(response.data['descendant_count'], 1)
+        self.assertNotIn('path', response.data)
+        self.assertNotIn('depth', response.data)
+
+        response = self.client.get(reverse('project_list'))
+        self.assertEqual(response.data['results'][0]['descendant_count'], 2)
+        self.assertNotIn('path', response.data['results'][0])
+
+        response = self.client.get(reverse('project_tree', kwargs={'pk': self.root.id}))
+        self.assertNotIn('depth', response.data['sub_projects'][0])
+        response = self.client.get(reverse('project_list'), {'fields': 'id,path'})
+        self.assertEqual(response.data['results'][0], {'id': self.root.id})
+
+    def test_delete_removes_subtree(self):
+        ProjectFile.objects.create(
+            project=self.grandchild,
+            file_type='Ссылка',
+            file_url='https://example.com/file'
+        )
+        response = self.client.delete(reverse('project_detail', kwargs={'pk': self.root.id}))
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(Project.objects.count(), 0)
+        self.assertEqual(ProjectFile.objects.count(), 0)
+
+    def test_path_collation(self):
+        field = Project._meta.get_field('path')
+        self.assertIsNone(field.db_parameters(connection)['collation'])
+
+        postgresql = mock.Mock(
+            vendor='postgresql', ops=connection.ops, data_types={'CharField': 'varchar(%(max_length)s)'},
+            data_type_check_constraints={},
+        )
+        self.assertEqual(field.db_parameters(postgresql), {'type': 'varchar(1024)', 'check': None, 'collation': 'C'})
+
+
+"""
+Test Project response cache
+Цель: Проверить инвалидацию кеша проектов
+Что проверяет:
+- Сбрасывается ли кеш проекта и его предков при добавлении файла в подпроект
+- Сбрасывается ли кеш списка проектов при создании проекта
+- Сбрасывается ли кеш потомков при переименовании проекта
+"""
+@override_settings(API_CACHE_ENABLED=True)
+class ProjectCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='projectcache', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.root = Project.objects.create(title='Root')
+        self.child = Project.objects.create(title='Child', parent_project=self.root)
+
+    def test_file_in_subproject_invalidates_ancestors(self):
+        tree_url = reverse('project_tree', kwargs={'pk': self.root.id})
+        detail_url = reverse('project_detail', kwargs={'pk': self.child.id})
+        self.assertEqual(self.client.get(tree_url).data['sub_projects'][0]['files'], [])
+        self.assertEqual(self.client.get(detail_url).data['files'], [])
+
+        ProjectFile.objects.create(project=self.child, file_type='Ссылка', file_url='https://example.com')
+
+        self.assertEqual(len(self.client.get(tree_url).data['sub_projects'][0]['files']), 1)
+        self.assertEqual(len(self.client.get(detail_url).data['files']), 1)
+
+    def test_project_list_invalidated_on_create(self):
+        url = reverse('project_list')
+        self.assertEqual(len(self.client.get(url).data['results']), 1)
+
+        Project.objects.create(title='Second root')
+
+        self.assertEqual(len(self.client.get(url).data['results']), 2)
+
+    def test_move_invalidates_subtree(self):
+        grandchild = Project.objects.create(title='Grandchild', parent_project=self.child)
+        url = reverse('project_detail', kwargs={'pk': grandchild.id})
+        self.assertEqual(len(self.client.get(url).data['ancestors']), 2)
+
+        self.child.parent_project = None
+        self.child.save()
+
+        self.assertEqual(len(self.client.get(url).data['ancestors']), 1)
+
+
+    def test_rename_invalidates_descendants(self):
+        grandchild = Project.objects.create(title='Grandchild', parent_project=self.child)
+        url = reverse('project_detail', kwargs={'pk': grandchild.id})
+        self.assertEqual(self.client.get(url).data['ancestors'][0]['title'], 'Root')
+
+        self.root.title = 'New root'
+        self.root.save()
+        self.assertEqual(self.client.get(url).data['ancestors'][0]['title'], 'New root')
+
+        self.root.title = 'Renamed root'
+        self.root.save(update_fields=['title'])
+        self.assertEqual(self.client.get(url).data['ancestors'][0]['title'], 'Renamed root')
+
+
+class FakeGoogleClient:
+    """
+    Подменяет google_api в тестах: создает документы без обращения к Google.
+    """
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.created = []
+
+    def create_documents(self, items):
+        if self.fail:
+            raise RuntimeError('Google API unavailable')
+        results = {}
+        for key, doc_type, title in items:
+            self.created.append((doc_type, title))
+            results[key] = (f'fake-{len(self.created)}', None)
+        return results
+
+    def document_url(self, doc_type, file_id):
+        return google_api.document_url(doc_type, file_id)
+
+
+"""
+Test background Google document creation
+Цель: Проверить фоновое создание документов Google Workspace
+Что проверяет:
+- Возвращает ли endpoint файл в состоянии pending и ID задачи без обращения к Google
+- Заполняет ли воркер ссылку на документ и переводит ли задачу в done
+- Переводятся ли задача и файл в failed после исчерпания попыток
+"""
+class DocumentJobTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='docuser', password='testpass')
+        cls.project = Project.objects.create(title='Docs')
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def enqueue(self):
+        url = reverse('create_google_service', kwargs={'project_id': self.project.id})
+        response = self.client.post(url, {'doc_type': 'sheet', 'title': 'Budget'}, format='json')
+        self.assertEqual(response.status_code, 202)
+        return response
+
+    def test_create_returns_pending_file(self):
+        response = self.enqueue()
+
+        self.assertEqual(response.data['file']['status'], ProjectFile.STATUS_PENDING)
+        job = DocumentJob.objects.get(pk=response.data['job_id'])
+        self.assertEqual(job.status, DocumentJob.STATUS_PENDING)
+
+    def test_worker_completes_job(self):
+        job_id = self.enqueue().data['job_id']
+        fake = FakeGoogleClient()
+
+        self.assertEqual(run_pending_jobs(client=fake), 1)
+        self.assertEqual(fake.created, [('sheet', 'Budget')])
+
+        response = self.client.get(reverse('document_job_status', kwargs={'job_id': job_id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], DocumentJob.STATUS_DONE)
+        self.assertEqual(response.data['file']['status'], ProjectFile.STATUS_READY)
+        self.assertEqual(response.data['file']['file_url'], 'https://docs.google.com/spreadsheets/d/fake-1/edit')
+
+    def test_worker_marks_failed_after_max_attempts(self):
+        job_id = self.enqueue().data['job_id']
+        fake = FakeGoogleClient(fail=True)
+
+        while run_pending_jobs(client=fake):
+            pass
+
+        job = DocumentJob.objects.select_related('project_file').get(pk=job_id)
+        self.assertEqual(job.status, DocumentJob.STATUS_FAILED)
+        self.assertEqual(job.project_file.status, ProjectFile.STATUS_FAILED)
+        self.assertIn('Google API unavailable', job.error)
+
+
+"""
+Test bulk document operations
+Цель: Проверить массовое создание и удаление документов проекта
+Что проверяет:
+- Возвращает ли bulk endpoint результат для каждого элемента, включая ошибки
+- Создает ли воркер все документы одним пакетом
+- Удаляются ли документы из Google Drive одним пакетным вызовом
+- Очищается ли Google Drive при удалении проекта
+- Сохраняются ли проект и записи файлов, которые не удалось удалить из Google Drive
+- Записывается ли в журнал ошибка открытия доступа к созданному документу
+"""
+class BulkDocumentTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='bulkuser', password='testpass')
+        cls.project = Project.objects.create(title='Workspace')
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def create_google_file(self, file_id, project=None):
+        return ProjectFile.objects.create(
+            project=project or self.project,
+            file_type='Документ',
+            file_url=f'https://docs.google.com/document/d/{file_id}/edit'
+        )
+
+    def test_bulk_create(self):
+        url = reverse('bulk_create_google_service', kwargs={'project_id': self.project.id})
+        documents = [
+            {'doc_type': 'doc', 'title': 'Plan'},
+            {'doc_type': 'unknown', 'title': 'Bad'},
+            {'doc_type': 'link', 'title': 'Site', 'file_url': 'https://example.com'},
+            {'doc_type': 'form', 'title': 'Survey'},
+        ]
+        response = self.client.post(url, {'documents': documents}, format='json')
+
+        self.assertEqual(response.status_code, 202)
+        results = response.data['results']
+        self.assertIn('job_id', results[0])
+        self.assertEqual(results[1]['error'], 'Invalid doc_type')
+        self.assertEqual(results[2]['file']['file_url'], 'https://example.com')
+        self.assertIn('job_id', results[3])
+
+        fake = FakeGoogleClient()
+        self.assertEqual(run_pending_jobs(client=fake), 2)
+        self.assertEqual(fake.created, [('doc', 'Plan'), ('form', 'Survey')])
+        self.assertEqual(ProjectFile.objects.filter(status=ProjectFile.STATUS_READY).count(), 3)
+
+    @mock.patch('project.views.delete_google_files')
+    def test_bulk_delete(self, delete_google_files):
+        ok = self.create_google_file('ok')
+        broken = self.create_google_file('broken')
+        delete_google_files.return_value = {'ok': None, 'broken': 'Permission denied'}
+
+        url = reverse('bulk_delete_project_files')
+        response = self.client.post(url, {'file_ids': [ok.id, broken.id, 9999]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        delete_google_files.assert_called_once_with(['ok', 'broken'])
+        self.assertEqual(response.data['results'], [
+            {'id': ok.id, 'status': 'deleted'},
+            {'id': broken.id, 'error': 'Permission denied'},
+            {'id': 9999, 'status': 'not_found'},
+        ])
+        self.assertEqual(list(ProjectFile.objects.values_list('id', flat=True)), [broken.id])
+
+    @mock.patch('project.views.delete_google_files')
+    def test_project_delete_cleans_up_drive(self, delete_google_files):
+        child = Project.objects.create(title='Child', parent_project=self.project)
+        self.create_google_file('root-doc')
+        self.create_google_file('child-doc', project=child)
+        delete_google_files.return_value = {}
+
+        response = self.client.delete(reverse('project_detail', kwargs={'pk': self.project.id}))
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(sorted(delete_google_files.call_args.args[0]), ['child-doc', 'root-doc'])
+
+    @mock.patch('project.views.delete_google_files')
+    def test_project_delete_keeps_files_left_in_drive(self, delete_google_files):
+        child = Project.objects.create(title='Child', parent_project=self.project)
+        self.create_google_file('root-doc')
+        broken = self.create_google_file('child-doc', project=child)
+        delete_google_files.return_value = {'root-doc': None, 'child-doc': 'Permission denied'}
+
+        response = self.client.delete(reverse('project_detail', kwargs={'pk': self.project.id}))
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.data['failed'], [broken.id])
+        self.assertEqual(list(ProjectFile.objects.values_list('id', flat=True)), [broken.id])
+        self.assertTrue(Project.objects.filter(pk=self.project.pk).exists())
+
+    @mock.patch('project.google_api.make_files_public', return_value={'doc-id': 'Forbidden'})
+    @mock.patch('project.google_api.execute_batch', return_value={'plan': ({'documentId': 'doc-id'}, None)})
+    @mock.patch('project.google_api.get_service')
+    def test_create_documents_logs_permission_error(self, get_service, execute_batch, make_files_public):
+        with self.assertLogs('project.google_api', level='WARNING') as logs:
+            results = google_api.create_documents([('plan', 'doc', 'Plan')])
+
+        self.assertEqual(results, {'plan': ('doc-id', None)})
+        self.assertIn('Forbidden', logs.output[0])
+
+
+"""
+Test async project views
+Цель: Проверить асинхронные представления, работающие с Google API
+Что проверяет:
+- Являются ли представления асинхронными (обрабатываются циклом событий под ASGI)
+- Выполняются ли параллельные вызовы Google API одновременно, не блокируя друг друга
+- Возвращает ли асинхронное представление детальную информацию о проекте
+"""
+class AsyncProjectViewTests(TransactionTestCase):
+    # AsyncClient выполняет каждый запрос в отдельном потоке ORM со своим подключением,
+    # поэтому данные теста должны быть зафиксированы, а не оставаться в транзакции TestCase
+    def setUp(self):
+        self.user = User.objects.create_user(username='asyncuser', password='testpass')
+        self.project = Project.objects.create(title='Async workspace')
+        self.client = AsyncClient()
+        self.headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    def test_views_are_async(self):
+        for view in (views.CreateGoogleDocumentView, views.BulkDeleteProjectFilesView, views.ProjectDetailView):
+            self.assertTrue(view.view_is_async, view.__name__)
+
+    async def test_google_calls_run_concurrently(self):
+        files = [
+            await ProjectFile.objects.acreate(
+                project=self.project, file_type='Документ',
+                file_url=f'https://docs.google.com/document/d/doc{i}/edit',
+            )
+            for i in range(2)
+        ]
+        # Оба вызова должны дойти до барьера одновременно, иначе ожидание прервется по таймауту
+        barrier = threading.Barrier(2, timeout=5)
+
+        def delete_google_file(file_id):
+            barrier.wait()
+            return True
+
+        with mock.patch('project.views.delete_google_file', side_effect=delete_google_file) as delete:
+            responses = await asyncio.gather(*(
+                self.client.delete(reverse('delete_project_file', kwargs={'file_id': f.id}), headers=self.headers) for f in files
+            ))
+
+        self.assertEqual([response.status_code for response in responses], [204, 204])
+        self.assertEqual(sorted(call.args[0] for call in delete.call_args_list), ['doc0', 'doc1'])
+        self.assertFalse(await ProjectFile.objects.aexists())
+
+    async def test_project_detail(self):
+        await ProjectFile.objects.acreate(project=self.project, file_type='Ссылка', file_url='https://example.com')
+
+        response = await self.client.get(reverse('project_detail', kwargs={'pk': self.project.id}), headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['title'], 'Async workspace')
+        self.assertEqual(len(response.json()['files']), 1)
+
+
+"""
+Test Google API service registry
+Цель: Проверить переиспользование клиентов Google API
+Что проверяет:
+- Строится ли клиент один раз на процесс для каждой пары (api, версия)
+- Получает ли каждый поток собственное HTTP-соединение
+- Не читаются ли учетные данные при импорте модуля
+- Сбрасывается ли состояние в дочернем процессе после fork
+"""
+ANONYMOUS_CREDENTIALS = AnonymousCredentials()
+
+
+@mock.patch('project.google_api.get_credentials', lambda: ANONYMOUS_CREDENTIALS)
+class GoogleServiceRegistryTests(TestCase):
+    def setUp(self):
+        google_api._reset_after_fork()
+
+    def test_service_is_built_once(self):
+        services = []
+        threads = [
+            threading.Thread(target=lambda: services.append(google_api.get_service('drive', 'v3')))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(service is services[0] for service in services))
+        self.assertIsNot(google_api.get_service('docs', 'v1'), services[0])
+
+    def test_requests_use_thread_local_http(self):
+        service = google_api.get_service('drive', 'v3')
+        request = service.files().delete(fileId='file')
+        self.assertIs(request.http, google_api.get_http())
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(service.files().delete(fileId='file').http))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], request.http)
+
+    def test_credentials_are_loaded_lazily(self):
+        self.assertIsNone(google_api._credentials)
+        self.assertEqual(google_api._services, {})
+
+    def test_state_is_reset_after_fork(self):
+        service = google_api.get_service('drive', 'v3')
+        google_api._reset_after_fork()
+
+        self.assertIsNot(google_api.get_service('drive', 'v3'), service)
+
+
+"""
+Test Google credentials loading
+Цель: Проверить кеширование учетных данных сервисного аккаунта
+Что проверяет:
+- Читается ли файл ключа один раз на процесс
+- Обновляется ли токен только когда он недействителен
+"""
+class GoogleCredentialsTests(TestCase):
+    def setUp(self):
+        google_api._reset_after_fork()
+        self.addCleanup(google_api._reset_after_fork)
+
+    @mock.patch('google.auth.transport.requests.Request')
+    @mock.patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    def test_credentials_are_cached_and_refreshed_centrally(self, from_file, request):
+        credentials = from_file.return_value
+        credentials.valid = False
+        credentials.refresh.side_effect = lambda request: setattr(credentials, 'valid', True)
+
+        self.assertIs(google_api.get_credentials(), credentials)
+        self.assertIs(google_api.get_credentials(), credentials)
+
+        from_file.assert_called_once()
+        credentials.refresh.assert_called_once()
 
-# Create your tests here.
@@ -0,0 +1,53 @@
+from django.db.models import Q
+
+from .models import Project
+
+
+def build_project_trees(roots, max_depth=None):
+    """
+    Собирает поддеревья проектов по материализованному пути.
+
+    Все узлы поддеревьев загружаются одним запросом по диапазонам
+    индексированного поля path, файлы проектов - еще одним, после чего
+    дерево собирается в памяти. Дочерние проекты каждого узла доступны
+    в атрибуте tree_children.
+
+    Args:
+        roots: Корневые проекты поддеревьев
+        max_depth: Максимальная глубина относительно корня (None - без ограничения)
+
+    Returns:
+        list: Корневые проекты с заполненными tree_children
+    """
+    roots = list(roots)
+    if not roots:
+        return []
+
+    subtree_filter = Q(pk__in=[root.pk for root in roots])
+    for root in roots:
+        descendants = Q(path__gt=root.path, path__lt=root.path_upper_bound)
+        if max_depth is not None:
+            descendants &= Q(depth__lte=root.depth + max_depth)
+        subtree_filter |= descendants
+
+    nodes = (
+        Project.objects
+        .filter(subtree_filter)
+        .with_descendant_count()
+        .prefetch_related('files')
+        .order_by('depth', 'pk')
+    )
+
+    by_id = {}
+    for node in nodes:
+        node.tree_children = []
+        by_id[node.pk] = node
+
+    root_ids = {root.pk for root in roots}
+    for node in by_id.values():
+        parent = by_id.get(node.parent_project_id)
+        # Корень, вложенный в другой корень, выводится только на верхнем уровне
+        if parent is not None and node.pk not in root_ids:
+            parent.tree_children.append(node)
+
+    return [by_id[root.pk] for root in roots]
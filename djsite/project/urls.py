@@ -21,8 +21,12 @@ schema_view = get_schema_view(
 urlpatterns = [
     path('', views.ProjectListView.as_view(), name='project_list'),
     path('<int:pk>/', views.ProjectDetailView.as_view(), name='project_detail'),
+    path('<int:pk>/tree/', views.ProjectTreeView.as_view(), name='project_tree'),
     path('create/', views.CreateProjectView.as_view(), name='create_project'),
     # path('create_parent/<int:parent_id>/', views.CreateProjectView.as_view(), name='create_project_with_parent'),
     path('<int:project_id>/create_google_service/', views.CreateGoogleDocumentView.as_view(), name='create_google_service'),
+    path('<int:project_id>/create_google_service/bulk/', views.BulkGoogleDocumentView.as_view(), name='bulk_create_google_service'),
     path('project_file/<int:file_id>/', views.CreateGoogleDocumentView.as_view(), name='delete_project_file'),
+    path('project_file/bulk_delete/', views.BulkDeleteProjectFilesView.as_view(), name='bulk_delete_project_files'),
+    path('document_jobs/<int:job_id>/', views.DocumentJobStatusView.as_view(), name='document_job_status'),
 ]
@@ -1,49 +1,147 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.shortcuts import get_object_or_404
-from .models import Project, ProjectFile
+from django.shortcuts import get_object_or_404, aget_object_or_404
+from .models import Project, ProjectFile, DocumentJob
 from user_account.models import Event
-from .serializers import ProjectSerializer, ProjectFileSerializer
-from .google_api import create_google_doc, create_google_sheet, create_google_slides, create_google_form, delete_google_file
+from .serializers import ProjectSerializer, ProjectFileSerializer, ProjectTreeSerializer, DocumentJobSerializer
+from .tree import build_project_trees
+from .google_api import GOOGLE_DOCUMENT_TYPES, delete_google_file, delete_google_files
+from .jobs import enqueue_document, enqueue_documents
+from .signals import invalidate_projects
+from user_account.cache import cache_response
+from user_account import metrics
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from user_account.pagination import CursorPaginationMixin
+from user_account.serializers import get_field_options
+from user_account.async_views import AsyncAPIView, run_in_thread
+from asgiref.sync import sync_to_async
+import logging
 
-class ProjectListView(APIView):
+logger = logging.getLogger(__name__)
+
+def get_max_depth(request):
+    """
+    Читает необязательный параметр запроса max_depth (неотрицательное целое).
+    """
+    max_depth = request.query_params.get('max_depth')
+    if max_depth in (None, ''):
+        return None
+    try:
+        max_depth = int(max_depth)
+    except ValueError:
+        raise ValidationError({"error": "max_depth must be a non-negative integer."})
+    if max_depth < 0:
+        raise ValidationError({"error": "max_depth must be a non-negative integer."})
+    return max_depth
+
+
+class ProjectListView(CursorPaginationMixin, APIView):
     """
     API представление для работы со списком проектов.
     Возвращает только корневые проекты (без родительского проекта).
     
     Методы:
-        get: Получение списка всех корневых проектов
+        get: Получение постраничного списка корневых проектов (кешируется, поддерживает ETag/If-None-Match)
+            Параметры:
+                fields: Выводимые поля (опционально, например id,title)
+                expand: Поля, скрытые в компактном списке: description, files (опционально)
+                tree: Вернуть каждый корневой проект с полным поддеревом (опционально)
+                max_depth: Максимальная глубина поддерева (опционально)
     """
     permission_classes = [IsAuthenticated]
+    replica_methods = ('GET', 'HEAD')
     
+    @cache_response('project_list')
     def get(self, request):
         projects = Project.objects.filter(parent_project__isnull=True)
-        serializer = ProjectSerializer(projects, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        if request.query_params.get('tree') in ('1', 'true', 'True'):
+            # Узлы деревьев загружает build_project_trees, от корней нужны только путь и глубина
+            roots = self.paginate_queryset(projects.only('id', 'path', 'depth'))
+            trees = build_project_trees(roots, max_depth=get_max_depth(request))
+            return self.get_paginated_response(metrics.serializer_data(ProjectTreeSerializer(trees, many=True)))
+
+        options = get_field_options(request, compact=True)
+        fields = ProjectSerializer(**options)
+        rows = fields.values_queryset(projects, extra=self.ordering_fields)
+        if rows is not None:
+            return self.get_paginated_response(fields.values_data(self.paginate_queryset(rows)))
+        sources = fields.get_sources()
+        if 'descendant_count' in fields.fields:
+            projects = projects.with_descendant_count()
+        projects = projects.only(*fields.get_only_fields(extra=['path'])).prefetch_related(
+            *[relation for relation in ('files', 'sub_projects') if relation in sources]
+        )
+        serializer = ProjectSerializer(self.paginate_queryset(projects), many=True, **options)
+        return self.get_paginated_response(metrics.serializer_data(serializer))
+
+    
+
+class ProjectDetailView(AsyncAPIView):
+    """
+    API представление для работы с отдельным проектом (асинхронное).
+    
+    Методы:
+        get: Получение детальной информации о проекте (кешируется, поддерживает ETag/If-None-Match)
+        delete: Удаление проекта со всем поддеревом и его документами в Google Drive
+            Если часть документов не удалось удалить из Drive, проект и их записи сохраняются,
+            а ответ 500 содержит ID этих файлов (failed)
+    """
+    permission_classes = [IsAuthenticated]
 
+    @cache_response('project', lookup_kwarg='pk')
+    async def get(self, request, pk):
+        project = await aget_object_or_404(Project.objects.with_descendant_count(), pk=pk)
+        # Файлы, подпроекты и предки загружаются сериализатором, поэтому он выполняется в потоке ORM
+        data = await sync_to_async(lambda: metrics.serializer_data(ProjectSerializer(project)))()
+        return Response(data, status=status.HTTP_200_OK)
     
+    async def delete(self, request, pk):
+        project = await aget_object_or_404(Project, pk=pk)
+        files = ProjectFile.objects.filter(
+            project__path__gte=project.path, project__path__lt=project.path_upper_bound
+        )
+        google_files = [f async for f in files if f.google_file_id]
+        if google_files:
+            # Документы удаляются из Google Drive batch-запросами, а не по одному;
+            # ожидание ответа Google не занимает поток ORM
+            errors = await run_in_thread(delete_google_files, [f.google_file_id for f in google_files])
+            failed = [f for f in google_files if errors.get(f.google_file_id)]
+            if failed:
+                for f in failed:
+                    logger.warning('Не удалось удалить файл %s из Google Drive: %s',
+                                   f.google_file_id, errors[f.google_file_id])
+                # Проект и файлы, оставшиеся в Google Drive, не удаляются: иначе документы
+                # остались бы в Drive без записей о них. Повторный запрос повторит удаление
+                deleted = [f.id for f in google_files if not errors.get(f.google_file_id)]
+                await ProjectFile.objects.filter(id__in=deleted).adelete()
+                return Response({
+                    "error": "Failed to delete files from Google Drive.",
+                    "failed": [f.id for f in failed],
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        await sync_to_async(project.delete)()
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
-class ProjectDetailView(APIView):
+class ProjectTreeView(APIView):
     """
-    API представление для работы с отдельным проектом.
+    API представление для получения всего поддерева проекта.
+    Поддерево загружается одним запросом по материализованному пути, а не запросом на каждый узел.
     
     Методы:
-        get: Получение детальной информации о проекте
-        delete: Удаление проекта
+        get: Получение проекта со всеми вложенными подпроектами и их файлами (кешируется)
+            Параметры:
+                max_depth: Максимальная глубина поддерева (опционально)
     """
     permission_classes = [IsAuthenticated]
 
+    @cache_response('project', lookup_kwarg='pk')
     def get(self, request, pk):
         project = get_object_or_404(Project, pk=pk)
-        serializer = ProjectSerializer(project)
-        return Response(serializer.data, status=status.HTTP_200_OK)
-    
-    def delete(self, request, pk):
-            project = get_object_or_404(Project, pk=pk)
-            project.delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
+        tree = build_project_trees([project], max_depth=get_max_depth(request))[0]
+        serializer = ProjectTreeSerializer(tree)
+        return Response(metrics.serializer_data(serializer), status=status.HTTP_200_OK)
+
 
 class CreateProjectView(APIView):
     """
@@ -76,13 +174,16 @@ class CreateProjectView(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class CreateGoogleDocumentView(APIView):
+class CreateGoogleDocumentView(AsyncAPIView):
     """
     API представление для создания и управления документами Google Workspace,
-    связанными с проектом.
+    связанными с проектом (асинхронное).
+    
+    Документы Google Workspace создаются в фоне (manage.py run_document_jobs):
+    ответ содержит файл в состоянии pending и ID задачи для DocumentJobStatusView.
     
     Методы:
-        post: Создание нового документа Google Workspace или добавление внешней ссылки
+        post: Постановка в очередь создания документа Google Workspace или добавление внешней ссылки
             Параметры:
                 doc_type: Тип документа ('doc', 'sheet', 'slide', 'form', 'link')
                 title: Название документа
@@ -95,7 +196,7 @@ class CreateGoogleDocumentView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
-    def post(self, request, project_id):
+    async def post(self, request, project_id):
         doc_type = request.data.get('doc_type')
         title = request.data.get('title')
         custom_name = request.data.get('custom_name')
@@ -107,8 +208,8 @@ class CreateGoogleDocumentView(APIView):
         if doc_type == 'link':
             if not file_url:
                 return Response({'error': 'file_url is required for link'}, status=400)
-            project = get_object_or_404(Project, pk=project_id)
-            project_file = ProjectFile.objects.create(
+            project = await aget_object_or_404(Project, pk=project_id)
+            project_file = await ProjectFile.objects.acreate(
                 project=project,
                 file_type='Ссылка',
                 file_url=file_url,
@@ -117,51 +218,146 @@ class CreateGoogleDocumentView(APIView):
             file_serializer = ProjectFileSerializer(project_file)
             return Response(file_serializer.data, status=status.HTTP_201_CREATED)
 
-        file_id, file_type, file_url = None, None, None
-        if doc_type == 'doc':
-            file_id = create_google_doc(title)
-            file_type = 'Документ'
-            file_url = f'https://docs.google.com/document/d/{file_id}/edit'
-        elif doc_type == 'sheet':
-            file_id = create_google_sheet(title)
-            file_type = 'Таблица'
-            file_url = f'https://docs.google.com/spreadsheets/d/{file_id}/edit'
-        elif doc_type == 'slide':
-            file_id = create_google_slides(title)
-            file_type = 'Презентация'
-            file_url = f'https://docs.google.com/presentation/d/{file_id}/edit'
-        elif doc_type == 'form':
-            file_id = create_google_form(title)
-            file_type = 'Форма'
-            file_url = f'https://docs.google.com/forms/d/{file_id}/edit'
-        else:
+        if doc_type not in GOOGLE_DOCUMENT_TYPES:
             return Response({'error': 'Invalid doc_type'}, status=status.HTTP_400_BAD_REQUEST)
 
-        project = get_object_or_404(Project, pk=project_id)
-        project_file = ProjectFile.objects.create(
-            project=project,
-            file_type=file_type,
-            file_url=file_url,
-            file_name=custom_name or title
-        )
-        file_serializer = ProjectFileSerializer(project_file)
-        return Response(file_serializer.data, status=status.HTTP_201_CREATED)
+        project = await aget_object_or_404(Project, pk=project_id)
+        job = await sync_to_async(enqueue_document)(project, doc_type, title, file_name=custom_name)
+        file_serializer = ProjectFileSerializer(job.project_file)
+        return Response({'file': file_serializer.data, 'job_id': job.id}, status=status.HTTP_202_ACCEPTED)
 
-    def delete(self, request, file_id):
+    async def delete(self, request, file_id):
         try:
-            project_file = get_object_or_404(ProjectFile, id=file_id)
-            # Если это ссылка, просто удаляем из базы
-            if project_file.file_type == 'Ссылка':
-                project_file.delete()
+            project_file = await aget_object_or_404(ProjectFile, id=file_id)
+            # Если это ссылка или документ еще не создан в Google Drive, просто удаляем из базы
+            if project_file.file_type == 'Ссылка' or not project_file.file_url:
+                await project_file.adelete()
                 return Response(status=status.HTTP_204_NO_CONTENT)
             # Для остальных файлов — удаляем из Google Drive
             file_url = project_file.file_url
             google_file_id = file_url.split('/')[-2]  # Получаем ID файла из URL
-            if delete_google_file(google_file_id):
-                project_file.delete()
+            if await run_in_thread(delete_google_file, google_file_id):
+                await project_file.adelete()
                 return Response(status=status.HTTP_204_NO_CONTENT)
             else:
                 return Response({"error": "Failed to delete file from Google Drive."}, 
                               status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class DocumentJobStatusView(APIView):
+    """
+    API представление для отслеживания фонового создания документа.
+    
+    Методы:
+        get: Получение состояния задачи (pending, running, done, failed) и связанного файла
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(DocumentJob.objects.select_related('project_file'), pk=job_id)
+        serializer = DocumentJobSerializer(job)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class BulkGoogleDocumentView(APIView):
+    """
+    API представление для создания нескольких документов проекта одним запросом.
+    Документы Google Workspace ставятся в очередь и создаются воркером batch-запросами.
+    
+    Методы:
+        post: Создание нескольких документов
+            Параметры:
+                documents: Список объектов {doc_type, title, custom_name, file_url}
+            Ответ содержит результат для каждого элемента: файл и ID задачи или ошибку
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, project_id):
+        project = get_object_or_404(Project, pk=project_id)
+        documents = request.data.get('documents')
+        if not isinstance(documents, list) or not documents:
+            return Response({"error": "documents must be a non-empty list."}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = [None] * len(documents)
+        queued, links = [], []
+        for index, item in enumerate(documents):
+            if not isinstance(item, dict):
+                results[index] = {'index': index, 'error': 'Each document must be an object.'}
+                continue
+            doc_type, title = item.get('doc_type'), item.get('title')
+            if not doc_type or not title:
+                results[index] = {'index': index, 'error': 'doc_type and title are required fields.'}
+            elif doc_type == 'link':
+                if item.get('file_url'):
+                    links.append((index, item))
+                else:
+                    results[index] = {'index': index, 'error': 'file_url is required for link'}
+            elif doc_type in GOOGLE_DOCUMENT_TYPES:
+                queued.append((index, (doc_type, title, item.get('custom_name'))))
+            else:
+                results[index] = {'index': index, 'error': 'Invalid doc_type'}
+
+        link_files = ProjectFile.objects.bulk_create([
+            ProjectFile(
+                project=project,
+                file_type='Ссылка',
+                file_url=item['file_url'],
+                file_name=item.get('custom_name') or item['title'],
+            )
+            for _, item in links
+        ])
+        if link_files:
+            invalidate_projects([project.pk])
+        for (index, _), project_file in zip(links, link_files):
+            results[index] = {'index': index, 'file': ProjectFileSerializer(project_file).data}
+
+        jobs = enqueue_documents(project, [item for _, item in queued]) if queued else []
+        for (index, _), job in zip(queued, jobs):
+            results[index] = {
+                'index': index,
+                'file': ProjectFileSerializer(job.project_file).data,
+                'job_id': job.id,
+            }
+
+        accepted = len(links) + len(jobs)
+        response_status = status.HTTP_202_ACCEPTED if accepted else status.HTTP_400_BAD_REQUEST
+        return Response({'results': results}, status=response_status)
+
+
+class BulkDeleteProjectFilesView(AsyncAPIView):
+    """
+    API представление для удаления нескольких файлов проекта одним запросом (асинхронное).
+    Документы удаляются из Google Drive batch-запросами.
+    
+    Методы:
+        post: Удаление файлов
+            Параметры:
+                file_ids: Список ID файлов проекта
+            Ответ содержит результат для каждого файла: deleted, not_found или ошибку
+    """
+    permission_classes = [IsAuthenticated]
+
+    async def post(self, request):
+        file_ids = request.data.get('file_ids')
+        if not isinstance(file_ids, list) or not file_ids or not all(isinstance(i, int) for i in file_ids):
+            return Response({"error": "file_ids must be a non-empty list of integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        files = await ProjectFile.objects.ain_bulk(file_ids)
+        google_file_ids = [f.google_file_id for f in files.values() if f.google_file_id]
+        errors = await run_in_thread(delete_google_files, google_file_ids) if google_file_ids else {}
+
+        results, deleted = [], []
+        for file_id in file_ids:
+            project_file = files.get(file_id)
+            if project_file is None:
+                results.append({'id': file_id, 'status': 'not_found'})
+            elif errors.get(project_file.google_file_id):
+                results.append({'id': file_id, 'error': errors[project_file.google_file_id]})
+            else:
+                deleted.append(project_file.pk)
+                results.append({'id': file_id, 'status': 'deleted'})
+        await ProjectFile.objects.filter(pk__in=deleted).adelete()
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class UserAccountConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'user_account'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,54 @@
+import inspect
+
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+
+def run_in_thread(func, *args, **kwargs):
+    """
+    Выполняет блокирующий вызов внешнего сервиса (Google API) в пуле потоков.
+
+    В отличие от sync_to_async по умолчанию вызов не занимает общий поток,
+    в котором выполняется ORM, поэтому параллельные запросы не ждут друг друга.
+    Из функции нельзя обращаться к базе данных.
+    """
+    return sync_to_async(func, thread_sensitive=False)(*args, **kwargs)
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView с асинхронными обработчиками (async def get/post/...).
+
+    Аутентификация, проверка прав и троттлинг выполняются через sync_to_async,
+    обработчик - в цикле событий. В обработчиках используется асинхронный ORM
+    (aget, acreate, async for) или sync_to_async; ленивые обращения к базе из
+    сериализатора недопустимы, поэтому связи нужно загружать заранее (prefetch_related).
+
+    Работает и под ASGI (uvicorn), и под WSGI: там Django выполняет асинхронное
+    представление в отдельном цикле событий.
+    """
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            # options и http_method_not_allowed остаются синхронными
+            if inspect.isawaitable(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -0,0 +1,165 @@
+import functools
+import hashlib
+import inspect
+import time
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from . import routers
+
+# Алиас кеша из CACHES: LocMemCache в разработке и тестах, Redis в продакшене
+CACHE_ALIAS = getattr(settings, 'API_CACHE_ALIAS', 'default')
+CACHE_TIMEOUT = getattr(settings, 'API_CACHE_TIMEOUT', 300)
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def cache_enabled():
+    """
+    Кеш ответов включается только с общим для всех процессов бэкендом (API_CACHE_ENABLED):
+    версии в LocMemCache не видны другим воркерам gunicorn, run_document_jobs
+    и командам управления, и процесс отдавал бы устаревшие ответы до истечения TTL.
+    """
+    return getattr(settings, 'API_CACHE_ENABLED', False)
+
+
+def _version_key(namespace, object_id=None):
+    if object_id is None:
+        return f'api:version:{namespace}'
+    return f'api:version:{namespace}:{object_id}'
+
+
+def _new_version():
+    # Версия, созданная после вытеснения ключа, не совпадет ни с одной из прежних
+    return time.time_ns()
+
+
+def get_versions(namespace, object_id=None):
+    """
+    Возвращает штамп версии для пространства имен и объекта одним обращением к кешу.
+
+    Штамп пространства имен позволяет сбросить сразу все объекты (например, после
+    массового UPDATE), штамп объекта - только один объект.
+    """
+    cache = get_cache()
+    keys = [_version_key(namespace)]
+    if object_id is not None:
+        keys.append(_version_key(namespace, object_id))
+    values = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = values.get(key)
+        if version is None:
+            cache.add(key, _new_version(), None)
+            version = cache.get(key)
+        versions.append(str(version))
+    return '.'.join(versions)
+
+
+def _bump(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), None)
+
+
+def bump_version(namespace, object_ids=None):
+    """
+    Инвалидирует закешированные ответы объектов (или всего пространства имен,
+    если object_ids не указан).
+
+    Версия повышается сразу и еще раз после фиксации транзакции, чтобы ответ,
+    закешированный конкурентным запросом до коммита, тоже стал недействительным.
+    """
+    if object_ids is None:
+        keys = [_version_key(namespace)]
+    else:
+        keys = [_version_key(namespace, object_id) for object_id in set(object_ids) if object_id is not None]
+    if not keys:
+        return
+
+    def bump_all():
+        for key in keys:
+            _bump(key)
+
+    bump_all()
+    transaction.on_commit(bump_all)
+
+
+def cache_response(namespace, lookup_kwarg=None, timeout=None):
+    """
+    Декоратор GET-метода APIView: кеширует данные ответа с ключом по версии объекта.
+
+    Ключ включает версию пространства имен, версию объекта (из kwargs[lookup_kwarg])
+    и строку запроса. Ответ содержит ETag; при совпадении If-None-Match
+    возвращается 304 без обращения к базе данных.
+
+    Поддерживает и асинхронные методы (AsyncAPIView). При выключенном кеше
+    (cache_enabled()) метод вызывается напрямую. Ответ для кеша строится по основной
+    базе, а не по реплике (routers.read_from_primary).
+
+    Args:
+        namespace: Пространство имен версий ('event', 'project', ...)
+        lookup_kwarg: Имя аргумента URL с ID объекта (None - версия только пространства имен)
+        timeout: Время жизни записи в секундах (по умолчанию API_CACHE_TIMEOUT)
+    """
+    def lookup(request, kwargs):
+        object_id = kwargs.get(lookup_kwarg) if lookup_kwarg else None
+        version = get_versions(namespace, object_id)
+        query_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()[:16]
+        etag = f'"{namespace}-{object_id}-{version}-{query_hash}"'
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+        if_none_match = request.headers.get('If-None-Match', '')
+        if etag in [tag.strip() for tag in if_none_match.split(',')]:
+            return None, headers, Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        key = f'api:response:{namespace}:{object_id}:{version}:{query_hash}'
+        data = get_cache().get(key)
+        if data is not None:
+            return key, headers, Response(data, headers=headers)
+        return key, headers, None
+
+    def store(key, headers, response):
+        if response.status_code == status.HTTP_200_OK:
+            get_cache().set(key, response.data, CACHE_TIMEOUT if timeout is None else timeout)
+            for header, value in headers.items():
+                response[header] = value
+        return response
+
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+            # Для AsyncAPIView: обращения к кешу выполняются через sync_to_async
+            @functools.wraps(method)
+            async def async_wrapper(view, request, *args, **kwargs):
+                if not cache_enabled():
+                    return await method(view, request, *args, **kwargs)
+                key, headers, cached = await sync_to_async(lookup)(request, kwargs)
+                if cached is not None:
+                    return cached
+                with routers.read_from_primary():
+                    response = await method(view, request, *args, **kwargs)
+                return await sync_to_async(store)(key, headers, response)
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if not cache_enabled():
+                return method(view, request, *args, **kwargs)
+            key, headers, cached = lookup(request, kwargs)
+            if cached is not None:
+                return cached
+            with routers.read_from_primary():
+                response = method(view, request, *args, **kwargs)
+            return store(key, headers, response)
+        return wrapper
+    return decorator
@@ -0,0 +1,140 @@
+"""
+Потоковая выгрузка мероприятий и задач в CSV и JSON Lines.
+
+Строки формируются по мере чтения из базы (iterator с chunk_size и prefetch_related
+по каждой порции), поэтому память воркера не зависит от объема выгрузки.
+"""
+import csv
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Prefetch
+
+from .models import Event, Tasks
+from .renderers import FastJSONRenderer
+
+CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+# Строк выгрузки на одно обращение к потоку ORM при отдаче под ASGI
+ASYNC_BATCH_SIZE = 200
+
+EVENT_COLUMNS = ['id', 'title', 'date', 'is_past', 'is_cancelled', 'organizers', 'participants']
+TASK_COLUMNS = ['id', 'task', 'status', 'deadline', 'is_past', 'event_id', 'event', 'creator', 'executors']
+# Символы, с которых Excel и LibreOffice начинают формулу
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _users():
+    return User.objects.select_related('userprofile').only('username', 'userprofile__full_name')
+
+
+def _user_name(user):
+    profile = getattr(user, 'userprofile', None)
+    return profile.full_name if profile and profile.full_name else user.username
+
+
+def event_rows():
+    events = (
+        Event.objects
+        .only('id', 'title', 'date', 'is_past', 'is_cancelled')
+        .prefetch_related(Prefetch('organizers', _users()), Prefetch('participants', _users()))
+        .order_by('id')
+    )
+    for event in events.iterator(chunk_size=CHUNK_SIZE):
+        yield {
+            'id': event.id,
+            'title': event.title,
+            'date': event.date,
+            'is_past': bool(event.is_past),
+            'is_cancelled': bool(event.is_cancelled),
+            'organizers': [_user_name(user) for user in event.organizers.all()],
+            'participants': [_user_name(user) for user in event.participants.all()],
+        }
+
+
+def task_rows(tasks=None):
+    """
+    Args:
+        tasks: Отфильтрованный queryset задач (по умолчанию - все задачи)
+    """
+    tasks = (
+        (Tasks.objects.all() if tasks is None else tasks)
+        .select_related('event', 'creator__userprofile')
+        .only(
+            'id', 'task', 'status', 'deadline', 'is_past', 'event', 'event__title',
+            'creator', 'creator__username', 'creator__userprofile__full_name',
+        )
+        .prefetch_related(Prefetch('executor', _users()))
+        .order_by('id')
+    )
+    statuses = dict(Tasks.STATUS)
+    for task in tasks.iterator(chunk_size=CHUNK_SIZE):
+        yield {
+            'id': task.id,
+            'task': task.task,
+            'status': statuses.get(task.status, task.status),
+            'deadline': task.deadline,
+            'is_past': task.is_past,
+            'event_id': task.event_id,
+            'event': task.event.title,
+            'creator': _user_name(task.creator),
+            'executors': [_user_name(user) for user in task.executor.all()],
+        }
+
+
+class Echo:
+    """
+    Буфер для csv.writer, возвращающий записанную строку вместо ее хранения.
+    """
+    def write(self, value):
+        return value
+
+
+def csv_cell(value):
+    """
+    Значение ячейки CSV. Текст, который табличный редактор принял бы за формулу
+    (названия и имена задают пользователи), экранируется апострофом.
+    """
+    if isinstance(value, list):
+        value = '; '.join(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(rows, columns):
+    writer = csv.writer(Echo())
+    yield '\ufeff'  # BOM, чтобы Excel открывал выгрузку в UTF-8
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([csv_cell(row[column]) for column in columns])
+
+
+def stream_jsonl(rows):
+    renderer = FastJSONRenderer()
+    for row in rows:
+        yield renderer.render(row) + b'\n'
+
+
+async def aiter_chunks(chunks, batch_size=None):
+    """
+    Асинхронный итератор над синхронным генератором выгрузки для ASGI.
+
+    StreamingHttpResponse под ASGI читает синхронный итератор целиком через
+    sync_to_async(list), поэтому выгрузка передается этой функции: порции по batch_size
+    строк читаются из генератора в потоке ORM и отдаются склеенными по мере готовности.
+    """
+    batch_size = batch_size or ASYNC_BATCH_SIZE
+    chunks = iter(chunks)
+    next_batch = sync_to_async(lambda: list(islice(chunks, batch_size)))
+    try:
+        while True:
+            batch = await next_batch()
+            if not batch:
+                return
+            yield batch[0][:0].join(batch)
+    finally:
+        # Курсор генератора закрывается в том же потоке, где был открыт
+        if hasattr(chunks, 'close'):
+            await sync_to_async(chunks.close)()
@@ -0,0 +1,131 @@
+from datetime import date
+
+from django.db.models import DateField, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+# Поля, по которым разрешена сортировка задач (?ordering=deadline,-status).
+# Значения всех полей входят в позицию курсора (ApiCursorPagination), поэтому
+# поля не должны принимать NULL: пустой срок заменяется на date.max
+TASK_ORDERING_FIELDS = {
+    'id': 'id',
+    'deadline': 'deadline_key',
+    'status': 'status',
+    'event': 'event_id',
+    'creator': 'creator_id',
+}
+TASK_STATUS_DONE = 3
+TRUE_VALUES = {'1', 'true', 'True'}
+FALSE_VALUES = {'0', 'false', 'False'}
+
+
+def _parse_bool(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValidationError({"error": f"{name} must be true or false."})
+
+
+def _parse_date(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({"error": f"{name} must be a date in YYYY-MM-DD format."})
+
+
+def _parse_user(params, name, request):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    if value == 'me':
+        return request.user.id
+    if not value.isdigit():
+        raise ValidationError({"error": f"{name} must be a user id or 'me'."})
+    return int(value)
+
+
+def filter_tasks(queryset, request):
+    """
+    Применяет фильтры из параметров запроса к задачам.
+
+    Параметры:
+        event_id: ID мероприятия
+        user_id: ID исполнителя или 'me'
+        creator: ID создателя или 'me'
+        status: Статус или список статусов через запятую (1,2)
+        deadline_from, deadline_to: Диапазон срока выполнения (включительно)
+        is_past: true/false
+        overdue: true - только просроченные невыполненные задачи
+    """
+    params = request.query_params
+
+    event_id = params.get('event_id')
+    if event_id:
+        queryset = queryset.filter(event_id=event_id)
+
+    executor = _parse_user(params, 'user_id', request)
+    if executor is not None:
+        queryset = queryset.filter(executor=executor)
+
+    creator = _parse_user(params, 'creator', request)
+    if creator is not None:
+        queryset = queryset.filter(creator_id=creator)
+
+    statuses = params.get('status')
+    if statuses:
+        try:
+            queryset = queryset.filter(status__in=[int(value) for value in statuses.split(',')])
+        except ValueError:
+            raise ValidationError({"error": "status must be a comma-separated list of integers."})
+
+    deadline_from = _parse_date(params, 'deadline_from')
+    if deadline_from:
+        queryset = queryset.filter(deadline__gte=deadline_from)
+    deadline_to = _parse_date(params, 'deadline_to')
+    if deadline_to:
+        queryset = queryset.filter(deadline__lte=deadline_to)
+
+    is_past = _parse_bool(params, 'is_past')
+    if is_past is not None:
+        queryset = queryset.filter(is_past=is_past)
+
+    if _parse_bool(params, 'overdue'):
+        queryset = queryset.filter(
+            deadline__lt=timezone.localdate(), is_past=False
+        ).exclude(status=TASK_STATUS_DONE)
+
+    return queryset
+
+
+def order_tasks(queryset, request):
+    """
+    Возвращает задачи, подготовленные к сортировке, и порядок для курсорной пагинации.
+
+    Срок выполнения может быть пустым, а курсор не допускает NULL, поэтому
+    сортировка по deadline идет по ключу, в котором пустой срок считается самым поздним.
+    """
+    ordering = []
+    for field in (request.query_params.get('ordering') or 'id').split(','):
+        field = field.strip()
+        descending = field.startswith('-')
+        name = field.lstrip('-')
+        if name not in TASK_ORDERING_FIELDS:
+            raise ValidationError({"error": f"Unsupported ordering field: {name}."})
+        ordering.append(('-' if descending else '') + TASK_ORDERING_FIELDS[name])
+
+    if any(field.lstrip('-') == 'deadline_key' for field in ordering):
+        queryset = queryset.annotate(
+            deadline_key=Coalesce('deadline', Value(date.max), output_field=DateField())
+        )
+    if not any(field.lstrip('-') == 'id' for field in ordering):
+        ordering.append('id')
+    return queryset, tuple(ordering)
+
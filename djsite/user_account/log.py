@@ -0,0 +1,206 @@
+"""
+Неблокирующее логирование: записи ставятся в очередь, а в файл и консоль
+их пишет отдельный поток QueueListener.
+
+Фильтры обработчика (маскирование, обрезка, выборка) выполняются в потоке запроса
+до постановки в очередь, форматирование - в потоке QueueListener.
+
+Файл открывается каждым процессом (воркеры gunicorn, run_document_jobs) на дозапись,
+поэтому сам обработчик его не ротирует: ротацию выполняет logrotate, а WatchedFileHandler
+переоткрывает перемещенный файл.
+"""
+import copy
+import json
+import logging
+import queue
+import random
+import re
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+
+CONSOLE_FORMAT = '{levelname} {asctime} {module} {process:d} {thread:d} {message}'
+
+# Ключи, значения которых не попадают в лог: по вхождению (new_password, api_token)
+# и точные имена JWT-токенов (access_level и refresh_interval не маскируются)
+SENSITIVE_KEYS = ('password', 'token', 'secret', 'authorization', 'credentials')
+SENSITIVE_EXACT_KEYS = ('access', 'refresh')
+SENSITIVE_PATTERN = re.compile(
+    r'''(?P<key>(?:(?:%s)\w*|\b(?:%s)\b)['"]?\s*[:=]\s*)(?P<value>'[^']*'|"[^"]*"|[^\s,;}&]+)'''
+    % ('|'.join(SENSITIVE_KEYS), '|'.join(SENSITIVE_EXACT_KEYS)),
+    re.IGNORECASE,
+)
+MASK = '***'
+
+# Атрибуты LogRecord, которые не считаются дополнительными полями (extra)
+RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+def _is_sensitive(key):
+    key = str(key).lower()
+    return key in SENSITIVE_EXACT_KEYS or any(name in key for name in SENSITIVE_KEYS)
+
+
+def redact(value, depth=0):
+    """
+    Маскирует значения чувствительных ключей в словарях и списках (в том числе QueryDict).
+    """
+    if depth > 5:
+        return value
+    if hasattr(value, 'lists'):  # QueryDict, MultiValueDict
+        value = {key: items[0] if len(items) == 1 else items for key, items in value.lists()}
+    if isinstance(value, dict):
+        return {key: MASK if _is_sensitive(key) else redact(item, depth + 1) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(redact(item, depth + 1) for item in value)
+    return value
+
+
+class RedactingFilter(logging.Filter):
+    """
+    Маскирует пароли и токены в аргументах, сообщении и extra и обрезает длинные сообщения.
+
+    max_length: Максимальная длина сообщения после подстановки аргументов
+    """
+    def __init__(self, max_length=2000, name=''):
+        super().__init__(name)
+        self.max_length = max_length
+
+    def filter(self, record):
+        if isinstance(record.args, dict):
+            record.args = redact(record.args)
+        elif record.args:
+            record.args = tuple(redact(arg) for arg in record.args)
+        try:
+            message = record.getMessage()
+        except Exception:
+            # Ошибку форматирования сообщит обработчик (handleError), запись не теряется
+            return True
+        lowered = message.lower()
+        if any(key in lowered for key in SENSITIVE_KEYS + SENSITIVE_EXACT_KEYS):
+            message = SENSITIVE_PATTERN.sub(lambda match: match.group('key') + MASK, message)
+        if len(message) > self.max_length:
+            message = f'{message[:self.max_length]}... [truncated {len(message) - self.max_length} chars]'
+        record.msg, record.args = message, None
+        for key in set(vars(record)) - RECORD_ATTRS:
+            setattr(record, key, MASK if _is_sensitive(key) else redact(getattr(record, key)))
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Пропускает только долю записей ниже level для указанных логгеров.
+
+    rates: {имя логгера: доля от 0 до 1}; действует и для дочерних логгеров,
+        выбирается самое длинное совпадающее имя
+    level: Записи этого уровня и выше пропускаются всегда
+    """
+    def __init__(self, rates=None, level=logging.WARNING, name=''):
+        super().__init__(name)
+        self.rates = rates or {}
+        self.level = level if isinstance(level, int) else logging.getLevelName(level)
+
+    def get_rate(self, logger_name):
+        best, rate = -1, 1.0
+        for name, value in self.rates.items():
+            if (logger_name == name or logger_name.startswith(name + '.')) and len(name) > best:
+                best, rate = len(name), value
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= self.level:
+            return True
+        rate = self.get_rate(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Одна запись - одна строка JSON: время, уровень, логгер, сообщение, место вызова,
+    исключение и дополнительные поля из extra.
+    """
+    def format(self, record):
+        data = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'line': record.lineno,
+            'process': record.process,
+            'thread': record.thread,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exception'] = record.exc_text
+        for key in set(vars(record)) - RECORD_ATTRS:
+            data[key] = getattr(record, key)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Обработчик, который только ставит запись в очередь.
+
+    Запись в файл (JSON) и, при console=True, в консоль выполняет QueueListener
+    в отдельном потоке. Очередь ограничена queue_size записями: при переполнении
+    новые записи отбрасываются, а не блокируют запрос.
+
+    Args:
+        filename: Файл лога (None или '' - только консоль); ротируется внешней утилитой
+        console: Дублировать записи в консоль
+        console_json: Писать в консоль JSON вместо текста (для сбора логов контейнера)
+        queue_size: Размер очереди
+    """
+    def __init__(self, filename=None, console=False, console_json=False, queue_size=10000):
+        super().__init__(queue.Queue(queue_size))
+        handlers = []
+        if filename:
+            file_handler = WatchedFileHandler(filename, encoding='utf-8', delay=True)
+            file_handler.setFormatter(JSONFormatter())
+            handlers.append(file_handler)
+        if console or not handlers:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(
+                JSONFormatter() if console_json else logging.Formatter(CONSOLE_FORMAT, style='{')
+            )
+            handlers.append(console_handler)
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        self.running = True
+
+    def enqueue(self, record):
+        if not self.running:
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+    def prepare(self, record):
+        # В отличие от QueueHandler.prepare сообщение не форматируется целиком:
+        # исключение сохраняется отдельно в exc_text для JSONFormatter
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def flush(self):
+        """
+        Дожидается, пока QueueListener запишет все записи из очереди.
+        """
+        if self.running:
+            self.queue.join()
+            for handler in self.listener.handlers:
+                handler.flush()
+
+    def close(self):
+        # Вызывается logging.shutdown() при завершении процесса и при перенастройке логирования
+        if self.running:
+            self.running = False
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+        super().close()
@@ -0,0 +1,20 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from user_account.cache import bump_version
+from user_account.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Помечает прошедшие мероприятия и их задачи как прошедшие (запускать периодически, например из cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=date.fromisoformat, help='Дата вместо сегодняшней (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        events, tasks = Event.objects.archive_past(today=options['date'])
+        if events or tasks:
+            # UPDATE не отправляет сигналы, поэтому сбрасываем кеш всех мероприятий
+            bump_version('event')
+        self.stdout.write(f'Архивировано мероприятий: {events}, задач: {tasks}')
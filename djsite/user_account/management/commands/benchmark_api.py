@@ -0,0 +1,278 @@
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from project.models import Project, ProjectFile
+from user_account import routers, search
+from user_account.cache import CACHE_ALIAS, get_cache
+from user_account.models import Event, EventMembership, Tasks, UserProfile
+from user_account.views import CustomTokenObtainPairSerializer
+
+# Отдельный кеш процесса: очистка перед запросами и версии синтетических данных
+# не должны попадать в общий кеш (Redis) работающего сервиса
+BENCHMARK_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark-api'}
+    for alias in {'default', CACHE_ALIAS}
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет время ответа, количество SQL-запросов и пиковую память основных эндпоинтов API '
+        'на синтетических данных и выводит результат в JSON. По умолчанию данные создаются '
+        'во временной тестовой базе. Кеш ответов хранится в памяти процесса и сбрасывается '
+        'перед каждым запросом'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Количество пользователей')
+        parser.add_argument('--events', type=int, default=300, help='Количество мероприятий')
+        parser.add_argument('--organizers', type=int, default=2, help='Организаторов у мероприятия')
+        parser.add_argument('--participants', type=int, default=10, help='Участников у мероприятия')
+        parser.add_argument('--tasks-per-event', type=int, default=5, help='Задач у мероприятия')
+        parser.add_argument('--executors', type=int, default=2, help='Исполнителей у задачи')
+        parser.add_argument('--project-depth', type=int, default=4, help='Глубина дерева проектов')
+        parser.add_argument('--project-children', type=int, default=3, help='Дочерних проектов у узла')
+        parser.add_argument('--files-per-project', type=int, default=2, help='Файлов у проекта')
+        parser.add_argument('--repeat', type=int, default=10, help='Количество замеров на эндпоинт')
+        parser.add_argument('--seed', type=int, default=0, help='Начальное значение генератора данных')
+        parser.add_argument('--output', help='Файл для результатов в JSON (по умолчанию - stdout)')
+        parser.add_argument('--compare', help='JSON предыдущего запуска для сравнения')
+        parser.add_argument('--max-regression', type=float,
+                            help='Ошибка, если медиана времени выросла больше чем на N%% или выросло число запросов')
+        parser.add_argument('--no-test-db', action='store_true',
+                            help='Использовать текущую базу: данные создаются в транзакции, которая откатывается')
+
+    def handle(self, *args, **options):
+        with self.mirror_replica():
+            if options['no_test_db']:
+                with transaction.atomic():
+                    result = self.run(options)
+                    transaction.set_rollback(True)
+            else:
+                old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+                try:
+                    result = self.run(options)
+                finally:
+                    connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        content = json.dumps(result, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(content)
+        else:
+            self.stdout.write(content)
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                self.compare(json.load(f), result, options['max_regression'])
+
+    @contextmanager
+    def mirror_replica(self):
+        """
+        Направляет реплику в базу замеров (как TEST MIRROR): синтетических данных в реплике нет.
+        Настройки default общие, поэтому и имя тестовой базы из create_test_db попадает в реплику.
+        """
+        if not routers.replica_configured():
+            yield
+            return
+        replica = connections[routers.REPLICA]
+        settings_dict = replica.settings_dict
+        replica.close()
+        replica.settings_dict = connections[DEFAULT_DB_ALIAS].settings_dict
+        try:
+            yield
+        finally:
+            replica.close()
+            replica.settings_dict = settings_dict
+
+    def run(self, options):
+        # MetricsMiddleware отключен, чтобы выборка SQL не влияла на замеры
+        with override_settings(DEBUG=False, METRICS_ENABLED=False, CACHES=BENCHMARK_CACHES):
+            data = self.create_data(options)
+            client = APIClient()
+            token = CustomTokenObtainPairSerializer.get_token(data['admin']).access_token
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+            results = {
+                name: self.measure(client, url, options['repeat'])
+                for name, url in self.get_endpoints(data)
+            }
+        dataset = {key: options[key] for key in (
+            'users', 'events', 'organizers', 'participants', 'tasks_per_event', 'executors',
+            'project_depth', 'project_children', 'files_per_project', 'repeat', 'seed',
+        )}
+        return {
+            'meta': {
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'dataset': dataset,
+            },
+            'results': results,
+        }
+
+    def get_endpoints(self, data):
+        event, root, user = data['event'], data['root'], data['user']
+        return [
+            ('events', reverse('api_events')),
+            ('events_expanded', reverse('api_events') + '?expand=description,tasks'),
+            ('event_detail', reverse('api_event_detail', args=[event.id])),
+            ('profile', reverse('api_profile', args=[user.id])),
+            ('users', reverse('api_user_list')),
+            ('tasks', reverse('api_tasks')),
+            ('tasks_filtered', reverse('api_tasks') + '?status=1,2&ordering=deadline'),
+            ('calendar', reverse('api_calendar') + '?view=month&date=2024-03-01'),
+            ('search', reverse('api_search') + '?q=benchmark'),
+            ('export_events', reverse('api_export', args=['events', 'csv'])),
+            ('projects', reverse('project_list')),
+            ('project_detail', reverse('project_detail', args=[root.id])),
+            ('project_tree', reverse('project_tree', args=[root.id])),
+        ]
+
+    def request(self, client, url):
+        get_cache().clear()
+        response = client.get(url)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response.status_code, len(body)
+
+    def measure(self, client, url, repeat):
+        self.request(client, url)  # прогрев
+
+        with CaptureQueriesContext(connection) as ctx:
+            status_code, size = self.request(client, url)
+        # captured_queries читает общий журнал запросов, который следующие запросы очищают
+        queries = len(ctx)
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            self.request(client, url)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        tracemalloc.start()
+        try:
+            self.request(client, url)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        timings.sort()
+        return {
+            'url': url,
+            'status': status_code,
+            'queries': queries,
+            'response_bytes': size,
+            'min_ms': round(timings[0], 3),
+            'median_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            'mean_ms': round(statistics.fmean(timings), 3),
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+
+    def compare(self, baseline, result, max_regression=None):
+        self.stderr.write(f'{"endpoint":<20}{"median, ms":>24}{"change":>10}{"queries":>14}')
+        failures = []
+        for name, current in result['results'].items():
+            previous = baseline.get('results', {}).get(name)
+            if previous is None:
+                self.stderr.write(f'{name:<20}{"-":>24}{"new":>10}{current["queries"]:>14}')
+                continue
+            change = (current['median_ms'] - previous['median_ms']) / previous['median_ms'] * 100 if previous['median_ms'] else 0
+            medians = f'{previous["median_ms"]:.1f} -> {current["median_ms"]:.1f}'
+            queries = f'{previous["queries"]} -> {current["queries"]}'
+            self.stderr.write(f'{name:<20}{medians:>24}{change:>+9.1f}%{queries:>14}')
+            if max_regression is not None and (change > max_regression or current['queries'] > previous['queries']):
+                failures.append(name)
+        if failures:
+            raise CommandError(f'Регрессия производительности: {", ".join(failures)}')
+
+    def create_data(self, options):
+        rng = random.Random(options['seed'])
+        password = make_password('benchmark')
+        users = User.objects.bulk_create([
+            User(username=f'benchmark_{i}', password=password, email=f'benchmark_{i}@example.com')
+            for i in range(max(options['users'], 1))
+        ])
+        UserProfile.objects.bulk_create([
+            UserProfile(user=user, full_name=f'Пользователь benchmark {i}', access_level=3 if i == 0 else 1)
+            for i, user in enumerate(users)
+        ])
+
+        projects = self.create_projects(options['project_depth'], options['project_children'])
+        ProjectFile.objects.bulk_create([
+            ProjectFile(project=project, file_type='document', file_name=f'Документ {i}',
+                        file_url=f'https://docs.google.com/document/d/benchmark{project.pk}_{i}/edit')
+            for project in projects for i in range(options['files_per_project'])
+        ])
+
+        start = date(2024, 1, 1)
+        events = Event.objects.bulk_create([
+            Event(title=f'Мероприятие benchmark {i}', description='Описание мероприятия ' * 20,
+                  date=start + timedelta(days=i % 365))
+            for i in range(max(options['events'], 1))
+        ])
+        # Связи создаются напрямую, поэтому индекс участия заполняется так же, как сигналом
+        memberships = []
+        for field, role, count in (
+            ('organizers', EventMembership.ROLE_ORGANIZER, options['organizers']),
+            ('participants', EventMembership.ROLE_PARTICIPANT, options['participants']),
+        ):
+            Through = getattr(Event, field).through
+            rows = [(event, user) for event in events for user in rng.sample(users, min(count, len(users)))]
+            Through.objects.bulk_create([Through(event_id=event.pk, user_id=user.pk) for event, user in rows])
+            memberships += [EventMembership(event=event, user=user, role=role) for event, user in rows]
+        EventMembership.objects.bulk_create(memberships, ignore_conflicts=True)
+        Event.projects.through.objects.bulk_create([
+            Event.projects.through(event_id=event.pk, project_id=rng.choice(projects).pk) for event in events
+        ])
+
+        tasks = Tasks.objects.bulk_create([
+            Tasks(task=f'Задача benchmark {i}', description='Описание задачи ' * 10, event=event,
+                  creator=rng.choice(users), status=rng.choice([1, 2, 3]),
+                  deadline=event.date + timedelta(days=rng.randint(-10, 10)))
+            for event in events for i in range(options['tasks_per_event'])
+        ])
+        Through = Tasks.executor.through
+        Through.objects.bulk_create([
+            Through(tasks_id=task.pk, user_id=user.pk)
+            for task in tasks for user in rng.sample(users, min(options['executors'], len(users)))
+        ])
+
+        search.rebuild_index()
+        return {'admin': users[0], 'user': users[0], 'event': events[0], 'root': projects[0]}
+
+    def create_projects(self, depth, children):
+        """
+        Создает дерево проектов по уровням через bulk_create, пути заполняются как в Project.save.
+        """
+        root = Project(title='Проект benchmark', description='Описание проекта ' * 10)
+        level, projects = [root], []
+        for current_depth in range(depth + 1):
+            Project.objects.bulk_create(level)
+            for project in level:
+                parent_path = project.parent_project.path if project.parent_project_id else '/'
+                project.path, project.depth = f'{parent_path}{project.pk}/', current_depth
+            Project.objects.bulk_update(level, ['path', 'depth'])
+            projects += level
+            if current_depth < depth:
+                level = [
+                    Project(title=f'Проект benchmark {parent.pk}.{i}', description='Описание проекта ' * 10,
+                            parent_project=parent)
+                    for parent in level for i in range(children)
+                ]
+        return projects
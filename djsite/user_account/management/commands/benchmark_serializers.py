@@ -0,0 +1,69 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from user_account.models import Event, Tasks
+from user_account.renderers import FastJSONRenderer
+from user_account.serializers import EventSerializer, TasksSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время выдачи списков мероприятий и задач: сериализатор по экземплярам '
+        'с JSONRenderer против строк values() с FastJSONRenderer. Тестовые данные создаются '
+        'в транзакции, которая затем откатывается'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=500, help='Количество мероприятий')
+        parser.add_argument('--tasks-per-event', type=int, default=5, help='Количество задач у мероприятия')
+        parser.add_argument('--repeat', type=int, default=5, help='Количество повторов (берется лучшее время)')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.create_data(options['events'], options['tasks_per_event'])
+            cases = [
+                ('events', EventSerializer, Event, {'compact': True}),
+                ('events ?fields=id,title,date', EventSerializer, Event, {'fields': ['id', 'title', 'date']}),
+                ('tasks', TasksSerializer, Tasks, {'compact': True}),
+            ]
+            self.stdout.write(f'{"case":<32}{"standard, ms":>14}{"fast, ms":>12}{"speedup":>10}')
+            for name, serializer_class, model, serializer_options in cases:
+                fields = serializer_class(**serializer_options)
+                # Стандартный путь - как в представлениях до быстрого пути: only() и нужные prefetch_related
+                queryset = model.objects.for_api(fields.get_sources()).only(*fields.get_only_fields())
+                standard = self.measure(options['repeat'], lambda: JSONRenderer().render(
+                    serializer_class(queryset.all(), many=True, **serializer_options).data
+                ))
+                fast = self.measure(options['repeat'], lambda: FastJSONRenderer().render(
+                    fields.values_data(list(fields.values_queryset(model.objects.all())))
+                ))
+                self.stdout.write(f'{name:<32}{standard * 1000:>14.1f}{fast * 1000:>12.1f}{standard / fast:>9.1f}x')
+            transaction.set_rollback(True)
+
+    def create_data(self, events, tasks_per_event):
+        users = User.objects.bulk_create([User(username=f'benchmark_{i}') for i in range(10)])
+        created = Event.objects.bulk_create([
+            Event(title=f'Мероприятие {i}', description='Описание ' * 50, date='2024-01-01')
+            for i in range(events)
+        ])
+        organizers = Event.organizers.through
+        organizers.objects.bulk_create([
+            organizers(event_id=event.pk, user_id=users[i % len(users)].pk) for i, event in enumerate(created)
+        ])
+        Tasks.objects.bulk_create([
+            Tasks(task=f'Задача {i}', description='Описание задачи ' * 20, event=event, creator=users[0])
+            for event in created for i in range(tasks_per_event)
+        ])
+
+    def measure(self, repeat, func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
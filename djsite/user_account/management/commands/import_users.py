@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from user_account.user_import import HASH_WORKERS, UserImportError, import_users, parse_rows
+
+
+class Command(BaseCommand):
+    help = 'Импортирует пользователей из CSV- или JSON-файла (поля как у UserProfileSerializer)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к CSV- или JSON-файлу')
+        parser.add_argument('--workers', type=int, default=HASH_WORKERS, help='Число процессов для хеширования паролей')
+
+    def handle(self, *args, **options):
+        with open(options['path'], 'rb') as f:
+            try:
+                rows = parse_rows(f.read(), options['path'])
+            except (ValueError, UnicodeDecodeError) as e:
+                raise CommandError(f'Некорректный файл: {e}')
+
+        try:
+            profiles = import_users(rows, workers=options['workers'])
+        except UserImportError as e:
+            for error in e.errors:
+                self.stderr.write(f"Строка {error['row'] + 1}: {error['errors']}")
+            raise CommandError('Импорт отменен, пользователи не созданы')
+        self.stdout.write(f'Создано пользователей: {len(profiles)}')
@@ -0,0 +1,110 @@
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест запущенного сервера: для каждого уровня параллельности отправляет '
+        'запросы к указанным путям и выводит в JSON пропускную способность (запросов в секунду) '
+        'и задержки p50/p95/p99. Используется для сравнения режимов SERVER_MODE=wsgi и asgi'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Адрес сервера')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Путь для запросов (можно указать несколько раз)')
+        parser.add_argument('--concurrency', default='1,10,50',
+                            help='Уровни параллельности через запятую')
+        parser.add_argument('--requests', type=int, default=200, help='Количество запросов на уровень')
+        parser.add_argument('--token', help='JWT access-токен')
+        parser.add_argument('--username', help='Логин для получения токена через /token/')
+        parser.add_argument('--password', help='Пароль для получения токена')
+        parser.add_argument('--timeout', type=float, default=30, help='Таймаут запроса в секундах')
+        parser.add_argument('--output', help='Файл для результатов в JSON (по умолчанию - stdout)')
+
+    def handle(self, *args, **options):
+        base_url = options['url'].rstrip('/')
+        paths = options['paths'] or ['/api/events/']
+        try:
+            levels = [int(value) for value in options['concurrency'].split(',') if value.strip()]
+        except ValueError:
+            raise CommandError('--concurrency: ожидаются целые числа через запятую')
+        if not levels or min(levels) < 1 or options['requests'] < 1:
+            raise CommandError('Параллельность и количество запросов должны быть положительными')
+
+        token = options['token']
+        if not token and options['username']:
+            token = self.get_token(base_url, options['username'], options['password'], options['timeout'])
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+
+        results = []
+        for concurrency in levels:
+            urls = [base_url + paths[i % len(paths)] for i in range(options['requests'])]
+            results.append(self.run(urls, headers, concurrency, options['timeout']))
+
+        content = json.dumps({'url': base_url, 'paths': paths, 'results': results}, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(content)
+        else:
+            self.stdout.write(content)
+
+    def get_token(self, base_url, username, password, timeout):
+        body = json.dumps({'username': username, 'password': password}).encode()
+        request = urllib.request.Request(
+            base_url + '/token/', data=body, headers={'Content-Type': 'application/json'},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return json.loads(response.read())['access']
+        except (urllib.error.URLError, KeyError, ValueError) as e:
+            raise CommandError(f'Не удалось получить токен: {e}')
+
+    def request(self, url, headers, timeout):
+        """
+        Returns:
+            tuple: (статус или None при ошибке соединения, время ответа в мс)
+        """
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except (urllib.error.URLError, OSError):
+            status = None
+        return status, (time.perf_counter() - start) * 1000
+
+    def run(self, urls, headers, concurrency, timeout):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            responses = list(executor.map(lambda url: self.request(url, headers, timeout), urls))
+        elapsed = time.perf_counter() - start
+
+        timings = sorted(duration for _, duration in responses)
+        statuses = {}
+        for status, _ in responses:
+            key = str(status) if status else 'error'
+            statuses[key] = statuses.get(key, 0) + 1
+
+        def percentile(q):
+            return round(timings[min(len(timings) - 1, int(len(timings) * q))], 3)
+
+        return {
+            'concurrency': concurrency,
+            'requests': len(responses),
+            'statuses': statuses,
+            'rps': round(len(responses) / elapsed, 1),
+            'mean_ms': round(statistics.fmean(timings), 3),
+            'p50_ms': round(statistics.median(timings), 3),
+            'p95_ms': percentile(0.95),
+            'p99_ms': percentile(0.99),
+            'max_ms': round(timings[-1], 3),
+        }
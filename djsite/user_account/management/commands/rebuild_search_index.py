@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from user_account.search import SEARCH_SOURCES, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает поисковый индекс (после массового импорта в обход сигналов или изменения стеммера)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', action='append', choices=list(SEARCH_SOURCES), dest='kinds',
+                            help='Тип объектов (можно указать несколько раз, по умолчанию - все)')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = rebuild_index(kinds=options['kinds'])
+        self.stdout.write(f'Проиндексировано объектов: {total}')
@@ -0,0 +1,233 @@
+"""
+Метрики запросов по эндпоинтам: время, запросы к БД, время сериализации и рендеринга,
+размер ответа.
+
+Данные агрегируются в памяти процесса в гистограммы с фиксированными границами
+(каждый воркер считает свои). Время ответа, размер и статус записываются для каждого
+запроса; запросы к БД, время сериализации и рендеринга - только для доли SAMPLE_RATE запросов,
+так как их сбор оборачивает каждый SQL-запрос.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+SAMPLE_RATE = getattr(settings, 'METRICS_SAMPLE_RATE', 0.1)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 1024 ** 2, 10 * 1024 ** 2)
+
+# (имя, описание, границы, только для выборки)
+METRICS = (
+    ('http_request_duration_seconds', 'Время обработки запроса', DURATION_BUCKETS, False),
+    ('http_response_size_bytes', 'Размер тела ответа', SIZE_BUCKETS, False),
+    ('db_queries', 'Количество SQL-запросов на запрос', QUERY_BUCKETS, True),
+    ('db_duration_seconds', 'Время выполнения SQL-запросов', DURATION_BUCKETS, True),
+    ('serializer_duration_seconds', 'Время построения данных ответа сериализаторами', DURATION_BUCKETS, True),
+    ('render_duration_seconds', 'Время рендеринга ответа в JSON', DURATION_BUCKETS, True),
+)
+
+_current = ContextVar('metrics_sample', default=None)
+
+
+class Histogram:
+    """
+    Гистограмма с фиксированными границами (как histogram в Prometheus).
+    """
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # последняя ячейка - +Inf
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """
+        Возвращает [(граница, количество значений <= границы)], последняя граница - inf.
+        """
+        total, result = 0, []
+        for bound, count in zip((*self.buckets, float('inf')), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q):
+        """
+        Оценка квантиля линейной интерполяцией внутри ячейки (как histogram_quantile).
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        lower, previous = 0, 0
+        for bound, total in self.cumulative():
+            if total >= rank:
+                if bound == float('inf'):
+                    return lower
+                return lower + (bound - lower) * (rank - previous) / ((total - previous) or 1)
+            lower, previous = bound, total
+        return lower
+
+
+class EndpointStats:
+    def __init__(self):
+        self.statuses = {}
+        self.histograms = {name: Histogram(buckets) for name, _, buckets, _ in METRICS}
+
+
+class Sample:
+    """
+    Измерения одного запроса из выборки.
+    """
+    def __init__(self):
+        self.db_queries = 0
+        self.db_duration_seconds = 0.0
+        self.serializer_duration_seconds = 0.0
+        self.render_duration_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Обертка для connection.execute_wrapper
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_duration_seconds += time.perf_counter() - start
+            self.db_queries += 1
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def reset(self):
+        with self.lock:
+            self.endpoints = {}
+
+    def record(self, endpoint, method, status_code, duration, size, sample=None):
+        values = {'http_request_duration_seconds': duration, 'http_response_size_bytes': size}
+        if sample is not None:
+            values.update(
+                db_queries=sample.db_queries,
+                db_duration_seconds=sample.db_duration_seconds,
+                serializer_duration_seconds=sample.serializer_duration_seconds,
+                render_duration_seconds=sample.render_duration_seconds,
+            )
+        with self.lock:
+            stats = self.endpoints.setdefault((endpoint, method), EndpointStats())
+            stats.statuses[status_code] = stats.statuses.get(status_code, 0) + 1
+            for name, value in values.items():
+                if value is not None:
+                    stats.histograms[name].observe(value)
+
+    def report(self):
+        """
+        Сводка по эндпоинтам, отсортированная по суммарному времени обработки.
+        """
+        with self.lock:
+            result = []
+            for (endpoint, method), stats in self.endpoints.items():
+                item = {
+                    'endpoint': endpoint,
+                    'method': method,
+                    'requests': sum(stats.statuses.values()),
+                    'statuses': dict(stats.statuses),
+                }
+                for name, histogram in stats.histograms.items():
+                    item[name] = {
+                        'count': histogram.count,
+                        'mean': histogram.sum / histogram.count if histogram.count else None,
+                        'p50': histogram.quantile(0.5),
+                        'p95': histogram.quantile(0.95),
+                        'p99': histogram.quantile(0.99),
+                    }
+                item['total_seconds'] = stats.histograms['http_request_duration_seconds'].sum
+                result.append(item)
+        return sorted(result, key=lambda item: item['total_seconds'], reverse=True)
+
+    def prometheus(self):
+        """
+        Метрики в текстовом формате Prometheus (text/plain; version=0.0.4).
+        """
+        def labels(endpoint, method, **extra):
+            pairs = {'endpoint': endpoint, 'method': method, **extra}
+            return ','.join(f'{key}="{_escape(value)}"' for key, value in pairs.items())
+
+        lines = ['# HELP http_requests_total Количество запросов', '# TYPE http_requests_total counter']
+        with self.lock:
+            endpoints = sorted(self.endpoints.items())
+            for (endpoint, method), stats in endpoints:
+                for status_code, count in sorted(stats.statuses.items()):
+                    lines.append(f'http_requests_total{{{labels(endpoint, method, status=status_code)}}} {count}')
+            for name, help_text, _, sampled in METRICS:
+                suffix = ' (выборка запросов)' if sampled else ''
+                lines += [f'# HELP {name} {help_text}{suffix}', f'# TYPE {name} histogram']
+                for (endpoint, method), stats in endpoints:
+                    histogram = stats.histograms[name]
+                    for bound, total in histogram.cumulative():
+                        le = '+Inf' if bound == float('inf') else _format(bound)
+                        lines.append(f'{name}_bucket{{{labels(endpoint, method, le=le)}}} {total}')
+                    lines.append(f'{name}_sum{{{labels(endpoint, method)}}} {_format(histogram.sum)}')
+                    lines.append(f'{name}_count{{{labels(endpoint, method)}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = Registry()
+
+
+def start_sample():
+    """
+    Создает измерение запроса и делает его текущим для timer().
+
+    Returns:
+        tuple: (Sample, токен для stop_sample())
+    """
+    sample = Sample()
+    return sample, _current.set(sample)
+
+
+def stop_sample(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timer(name):
+    """
+    Добавляет время выполнения блока к измерению name текущего запроса из выборки.
+    Вне выборки ничего не делает.
+    """
+    sample = _current.get()
+    if sample is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(sample, name, getattr(sample, name) + time.perf_counter() - start)
+
+
+def serializer_data(serializer):
+    """
+    Возвращает serializer.data, добавляя время к serializer_duration_seconds.
+    В замер входят и запросы, которые сериализатор выполняет лениво (связи без prefetch).
+    """
+    with timer('serializer_duration_seconds'):
+        return serializer.data
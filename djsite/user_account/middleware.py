@@ -0,0 +1,127 @@
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.urls import Resolver404, resolve
+
+from . import metrics, routers
+
+
+class MetricsMiddleware:
+    """
+    Собирает метрики запросов по имени URL (api_events, project_detail, ...).
+
+    Для доли metrics.SAMPLE_RATE запросов SQL-запросы всех подключений оборачиваются
+    (как connection.execute_wrapper) для подсчета количества и времени.
+    Работает в синхронном и асинхронном режимах, чтобы под ASGI не переводить
+    асинхронные представления в поток.
+    Отключается настройкой METRICS_ENABLED = False.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def add_wrapper(sample):
+        for connection in connections.all():
+            connection.execute_wrappers.append(sample)
+
+    @staticmethod
+    def remove_wrapper(sample):
+        for connection in connections.all():
+            if sample in connection.execute_wrappers:
+                connection.execute_wrappers.remove(sample)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        sampled = random.random() < metrics.SAMPLE_RATE
+        start = time.perf_counter()
+        if sampled:
+            sample, token = metrics.start_sample()
+            self.add_wrapper(sample)
+            try:
+                response = self.get_response(request)
+            finally:
+                self.remove_wrapper(sample)
+                metrics.stop_sample(token)
+        else:
+            sample = None
+            response = self.get_response(request)
+        return self.record(request, response, time.perf_counter() - start, sample)
+
+    async def __acall__(self, request):
+        sampled = random.random() < metrics.SAMPLE_RATE
+        start = time.perf_counter()
+        if sampled:
+            sample, token = metrics.start_sample()
+            # Подключения к базе привязаны к потоку, в котором выполняется ORM запроса
+            await sync_to_async(self.add_wrapper)(sample)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(self.remove_wrapper)(sample)
+                metrics.stop_sample(token)
+        else:
+            sample = None
+            response = await self.get_response(request)
+        return self.record(request, response, time.perf_counter() - start, sample)
+
+    def record(self, request, response, duration, sample):
+        match = request.resolver_match
+        endpoint = match.view_name if match else '<unresolved>'
+        # Размер потокового ответа неизвестен до конца передачи
+        size = None if response.streaming else len(response.content)
+        metrics.registry.record(endpoint, request.method, response.status_code, duration, size, sample)
+        return response
+
+
+class ReplicaMiddleware:
+    """
+    Направляет чтение в реплику для представлений только для чтения.
+
+    Представление отмечается атрибутом replica_methods (например, ('GET', 'HEAD')).
+    Для таких методов обработка запроса выполняется внутри routers.read_from_replica().
+    Без настроенной реплики (DATABASE_REPLICA_URL) не подключается.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not routers.replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def is_read_only(self, request):
+        try:
+            match = resolve(request.path_info, getattr(request, 'urlconf', None))
+        except Resolver404:
+            return False
+        return request.method in routers.get_replica_methods(match.func)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.is_read_only(request):
+            return self.get_response(request)
+        with routers.read_from_replica():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if not self.is_read_only(request):
+            return await self.get_response(request)
+        with routers.read_from_replica():
+            return await self.get_response(request)
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_memberships(apps, schema_editor):
+    Event = apps.get_model('user_account', 'Event')
+    EventMembership = apps.get_model('user_account', 'EventMembership')
+    memberships = [
+        EventMembership(user_id=user_id, event_id=event_id, role='organizer')
+        for event_id, user_id in Event.organizers.through.objects.values_list('event_id', 'user_id')
+    ] + [
+        EventMembership(user_id=user_id, event_id=event_id, role='participant')
+        for event_id, user_id in Event.participants.through.objects.values_list('event_id', 'user_id')
+    ]
+    EventMembership.objects.bulk_create(memberships, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_account', '0010_tasks_is_past'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('organizer', 'Организатор'), ('participant', 'Участник')], max_length=20)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='user_account.event')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_memberships', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'event', 'role'), name='unique_event_membership')],
+            },
+        ),
+        migrations.RunPython(fill_memberships, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_account', '0012_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='date',
+            field=models.DateField(db_index=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:24
+
+from django.db import migrations, models
+
+
+def install_search_backend(apps, schema_editor):
+    from user_account.search import get_backend
+    get_backend(schema_editor.connection).install(schema_editor)
+
+
+def uninstall_search_backend(apps, schema_editor):
+    from user_account.search import get_backend
+    get_backend(schema_editor.connection).uninstall(schema_editor)
+
+
+def fill_search_index(apps, schema_editor):
+    from user_account.search import rebuild_index
+    rebuild_index(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_account', '0013_event_date_index'),
+        ('project', '0006_document_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('event', 'Мероприятие'), ('task', 'Задача'), ('project', 'Проект'), ('profile', 'Профиль')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('document_title', models.TextField(blank=True)),
+                ('document', models.TextField(blank=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_entry')],
+            },
+        ),
+        migrations.RunPython(install_search_backend, uninstall_search_backend),
+        migrations.RunPython(fill_search_index, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from project.models import Project
 from datetime import date
 from phonenumber_field.modelfields import PhoneNumberField
@@ -41,6 +42,55 @@ class UserProfile(models.Model):
         return self.user.username
 
 
+class EventQuerySet(models.QuerySet):
+    """
+    Набор запросов для мероприятий.
+    """
+    def for_api(self, sources=None):
+        """
+        Подгружает все связи, которые использует EventSerializer,
+        чтобы сериализация списка выполнялась за постоянное число запросов.
+
+        Args:
+            sources: Источники полей сериализатора; подгружаются только связи из них
+                (по умолчанию - все)
+        """
+        lookups = {
+            'organizers': 'organizers',
+            'participants': 'participants',
+            'projects': 'projects',
+            'tasks_for_event': models.Prefetch('tasks_for_event', queryset=Tasks.objects.for_api()),
+        }
+        return self.prefetch_related(*[
+            lookup for source, lookup in lookups.items() if sources is None or source in sources
+        ])
+
+    def archive_past(self, today=None):
+        """
+        Помечает прошедшие мероприятия и их задачи как is_past двумя UPDATE-запросами.
+        Сигналы моделей при этом не отправляются.
+
+        Args:
+            today: Дата, до которой мероприятия считаются прошедшими (по умолчанию - сегодня)
+
+        Returns:
+            tuple: Количество обновленных мероприятий и задач
+        """
+        today = today or timezone.localdate()
+        past = self.filter(date__lt=today)
+        with transaction.atomic():
+            events = past.filter(is_past=0).update(is_past=1)
+            tasks = Tasks.objects.filter(event__in=past, is_past=False).update(is_past=True)
+        return events, tasks
+
+    def for_user(self, user):
+        """
+        Мероприятия, в которых пользователь организатор или участник,
+        одним запросом по индексу EventMembership.
+        """
+        return self.filter(pk__in=EventMembership.objects.filter(user=user).values('event_id'))
+
+
 class Event(models.Model):
     """
     Модель мероприятия или события.
@@ -58,7 +108,7 @@ class Event(models.Model):
     """
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
-    date = models.DateField()
+    date = models.DateField(db_index=True)
     organizers = models.ManyToManyField(User, related_name='organized_events', blank=True)
     files = models.FileField(upload_to='event_files/', blank=True, null=True)
     participants = models.ManyToManyField(User, related_name='events', blank=True)
@@ -66,16 +116,87 @@ class Event(models.Model):
     is_past = models.IntegerField(default=0)
     is_cancelled = models.BooleanField(null=True, blank=True, default=False)
 
+    objects = EventQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_tasks_past = instance._tasks_past_state()
+        return instance
+
+    def _tasks_past_state(self):
+        # None, если поля не загружены (например, при only()/defer())
+        if 'is_past' not in self.__dict__ or 'is_cancelled' not in self.__dict__:
+            return None
+        return bool(self.is_past or self.is_cancelled)
+
     def save(self, *args, **kwargs):
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
         super().save(*args, **kwargs)
+
+        # У нового мероприятия задач еще нет, а поля is_past/is_cancelled могли не измениться
+        if adding:
+            self._loaded_tasks_past = self._tasks_past_state()
+            return
+        if update_fields is not None and not {'is_past', 'is_cancelled'} & set(update_fields):
+            return
+        is_event_past = self._tasks_past_state()
+        if is_event_past is None or is_event_past == getattr(self, '_loaded_tasks_past', None):
+            return
         # После сохранения обновляем is_past у всех задач этого мероприятия
-        from .models import Tasks
-        is_event_past = self.is_past or self.is_cancelled
         Tasks.objects.filter(event=self).update(is_past=is_event_past)
+        self._loaded_tasks_past = is_event_past
 
     def __str__(self):
         return self.title
 
+class EventMembership(models.Model):
+    """
+    Денормализованный индекс участия пользователей в мероприятиях.
+    Поддерживается автоматически по изменениям Event.organizers и Event.participants.
+    
+    Attributes:
+        user (ForeignKey): Пользователь
+        event (ForeignKey): Мероприятие
+        role (CharField): Роль пользователя в мероприятии (organizer, participant)
+    """
+    ROLE_ORGANIZER = 'organizer'
+    ROLE_PARTICIPANT = 'participant'
+    ROLES = [
+        (ROLE_ORGANIZER, 'Организатор'),
+        (ROLE_PARTICIPANT, 'Участник'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='event_memberships')
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='memberships')
+    role = models.CharField(max_length=20, choices=ROLES)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'event', 'role'], name='unique_event_membership'),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} - {self.event_id} ({self.role})'
+
+
+class TasksQuerySet(models.QuerySet):
+    """
+    Набор запросов для задач.
+    """
+    def for_api(self, sources=None):
+        """
+        Подгружает исполнителей задач для TasksSerializer.
+
+        Args:
+            sources: Источники полей сериализатора (по умолчанию - все)
+        """
+        if sources is not None and 'executor' not in sources:
+            return self
+        return self.prefetch_related('executor')
+
+
 class Tasks(models.Model):
     """
     Модель задачи, связанной с мероприятием.
@@ -103,6 +224,57 @@ class Tasks(models.Model):
     ]
     status = models.PositiveSmallIntegerField(choices=STATUS, default=2)
     is_past = models.BooleanField(default=False)
-    
+
+    objects = TasksQuerySet.as_manager()
+
+    class Meta:
+        # Индексы под фильтры списка задач (см. filters.filter_tasks)
+        indexes = [
+            models.Index(fields=['event', 'status'], name='tasks_event_status_idx'),
+            models.Index(fields=['deadline', 'is_past'], name='tasks_deadline_past_idx'),
+            models.Index(fields=['creator', 'status'], name='tasks_creator_status_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Исходное мероприятие нужно для инвалидации кеша при переносе задачи
+        instance._loaded_event_id = instance.__dict__.get('event_id')
+        return instance
+
     def __str__(self):
         return self.task
+
+
+class SearchEntry(models.Model):
+    """
+    Запись поискового индекса по мероприятиям, задачам, проектам и профилям.
+    Полнотекстовый индекс над записями строит бэкенд из search.py
+    (FTS5 в SQLite, tsvector в PostgreSQL).
+    
+    Attributes:
+        kind (CharField): Тип объекта (event, task, project, profile)
+        object_id (PositiveIntegerField): ID объекта
+        title (CharField): Заголовок для вывода в результатах
+        document_title (TextField): Основы слов заголовка
+        document (TextField): Основы слов остального текста
+    """
+    KIND_CHOICES = [
+        ('event', 'Мероприятие'),
+        ('task', 'Задача'),
+        ('project', 'Проект'),
+        ('profile', 'Профиль'),
+    ]
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=255)
+    document_title = models.TextField(blank=True)
+    document = models.TextField(blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_entry'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} {self.object_id}: {self.title}'
@@ -0,0 +1,152 @@
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class ApiCursorPagination(CursorPagination):
+    """
+    Курсорная (keyset) пагинация для списковых эндпоинтов API.
+
+    Размер страницы берется из REST_FRAMEWORK['PAGE_SIZE'] и может быть изменен
+    параметром запроса ?page_size= в пределах API_MAX_PAGE_SIZE.
+
+    Позиция курсора составная - значения всех полей сортировки, а не только первого,
+    как в CursorPagination. Страница отбирается условием (f1, .., fn) > (v1, .., vn),
+    поэтому первым может быть поле с повторяющимися значениями (статус, мероприятие):
+    последнее поле уникально, и DRF не переходит к смещению внутри равных позиций,
+    которое ограничено offset_cutoff.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 500)
+    ordering = ('id',)
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Повторяет CursorPagination.paginate_queryset, кроме фильтра по позиции
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(self.get_position_filter(current_position, reverse))
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_position_filter(self, position, reverse):
+        """
+        Условие "строка после позиции" в порядке сортировки:
+        f1 > v1 OR (f1 = v1 AND f2 > v2) OR ... (для полей по убыванию и обратного курсора - <).
+        Дополнительное f1 >= v1 позволяет использовать индекс по первому полю.
+
+        Raises:
+            NotFound: Позиция курсора не соответствует сортировке
+        """
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        condition = Q()
+        equal = Q()
+        for order, value in zip(self.ordering, values):
+            field = order.lstrip('-')
+            # (курсор назад) XOR (поле по убыванию)
+            lookup = 'lt' if reverse != order.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+
+        first = self.ordering[0]
+        lookup = 'lte' if reverse != first.startswith('-') else 'gte'
+        return Q(**{f'{first.lstrip("-")}__{lookup}': values[0]}) & condition
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            field = order.lstrip('-')
+            value = instance[field] if isinstance(instance, dict) else getattr(instance, field)
+            values.append(str(value))
+        return json.dumps(values, separators=(',', ':'))
+
+
+class CursorPaginationMixin:
+    """
+    Подключает курсорную пагинацию к APIView по аналогии с GenericAPIView.
+
+    Attributes:
+        pagination_class: Класс пагинации
+        ordering: Стабильный порядок сортировки списка (последнее поле должно быть уникальным)
+    """
+    pagination_class = ApiCursorPagination
+    ordering = ('id',)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            self._paginator = self.pagination_class(ordering=self.ordering)
+        return self._paginator
+
+    @property
+    def ordering_fields(self):
+        """
+        Колонки сортировки без направления: курсор строится из них, поэтому они
+        передаются в values_queryset(extra=...) даже при разреженном ?fields=
+        """
+        return [field.lstrip('-') for field in self.ordering]
+
+    def paginate_queryset(self, queryset):
+        return self.paginator.paginate_queryset(queryset, self.request, view=self)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
@@ -0,0 +1,77 @@
+"""
+Права доступа по уровню пользователя (UserProfile.access_level).
+
+Уровень определяется один раз за запрос и кешируется на объекте запроса:
+- из профиля пользователя, если он уже загружен (ProfileJWTAuthentication загружает
+  его вместе с пользователем через select_related, иначе - один запрос на весь запрос);
+- из claim access_level токена, если пользователь построен из токена без обращения
+  к базе (JWTStatelessUserAuthentication).
+"""
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework.permissions import BasePermission
+
+VIEWER, EDITOR, ADMIN = 1, 2, 3
+
+ACCESS_DENIED = {"error": "Access denied"}
+
+
+def get_access_level(request):
+    """
+    Возвращает уровень доступа текущего пользователя (0 - без профиля или не аутентифицирован).
+    """
+    if hasattr(request, '_access_level'):
+        return request._access_level
+
+    user = request.user
+    level = 0
+    if user and user.is_authenticated:
+        if hasattr(user, 'token'):
+            # TokenUser: профиля нет, уровень берется из токена
+            level = user.token.get('access_level') or 0
+        else:
+            try:
+                level = user.userprofile.access_level
+            except ObjectDoesNotExist:
+                level = 0
+    request._access_level = level
+    return level
+
+
+class AccessLevelPermission(BasePermission):
+    """
+    Базовое право: access_level пользователя не ниже level.
+
+    methods: Методы, к которым применяется проверка (None - все методы).
+    Ответ при отказе - 403 {"error": "Access denied"}.
+    """
+    level = 0
+    methods = None
+    message = ACCESS_DENIED
+
+    @classmethod
+    def on(cls, *methods):
+        """
+        Возвращает то же право, проверяемое только для указанных методов.
+        Пример: permission_classes = [IsAuthenticated, IsAdmin.on('PUT', 'DELETE')]
+        """
+        methods = {method.upper() for method in methods}
+        if 'GET' in methods:
+            methods.add('HEAD')
+        return type(cls.__name__, (cls,), {'methods': frozenset(methods)})
+
+    def has_permission(self, request, view):
+        if self.methods is not None and request.method not in self.methods:
+            return True
+        return get_access_level(request) >= self.level
+
+
+class IsViewer(AccessLevelPermission):
+    level = VIEWER
+
+
+class IsEditor(AccessLevelPermission):
+    level = EDITOR
+
+
+class IsAdmin(AccessLevelPermission):
+    level = ADMIN
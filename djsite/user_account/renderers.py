@@ -0,0 +1,59 @@
+"""
+Быстрые JSON-рендерер и парсер на orjson.
+
+Если orjson не установлен, используются стандартные JSONRenderer и JSONParser DRF.
+"""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+from . import metrics
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - зависимость необязательна
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON-рендерер на orjson с тем же форматом вывода, что у JSONRenderer.
+
+    Даты, Decimal, ленивые строки и прочие типы, которые orjson не выводит сам
+    или выводит иначе, кодируются JSONEncoder из DRF. Ответы с отступами
+    (Accept: application/json; indent=4, Browsable API) рендерятся стандартно.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with metrics.timer('render_duration_seconds'):
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=encoders.JSONEncoder().default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+        # Как и JSONRenderer, экранируем \u2028 и \u2029 для совместимости с JavaScript
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSON-парсер на orjson. Тела в кодировке, отличной от UTF-8, разбираются стандартно.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,87 @@
+"""
+Маршрутизация запросов к реплике базы данных.
+
+Чтение уходит в реплику только внутри read_from_replica(): его включает ReplicaMiddleware
+для методов, перечисленных в атрибуте replica_methods представления. Запись и чтение
+остальных представлений выполняются в основной базе, поэтому задержка репликации
+не влияет на ответы после изменения данных.
+
+Представления с cache_response при включенном кеше читают из основной базы:
+ответ, построенный по отстающей реплике, сохранился бы под новой версией кеша
+и отдавался бы до истечения TTL.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA = 'replica'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+@contextmanager
+def read_from_replica():
+    """
+    Направляет чтение в реплику до конца блока (в том числе из sync_to_async).
+    """
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+@contextmanager
+def read_from_primary():
+    """
+    Отменяет read_from_replica() до конца блока.
+    """
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def uses_replica():
+    return _use_replica.get()
+
+
+def replica_configured():
+    return REPLICA in connections.settings
+
+
+def replica_available():
+    """
+    Настроена ли реплика как отдельная база. В тестах (TEST MIRROR) реплика - та же база,
+    что и default, а отдельное подключение не видело бы данные из транзакции теста.
+    """
+    if not replica_configured():
+        return False
+    return connections[REPLICA].settings_dict['NAME'] != connections[DEFAULT_DB_ALIAS].settings_dict['NAME']
+
+
+def get_replica_methods(view):
+    """
+    Методы HTTP, для которых представление читает из реплики (атрибут replica_methods класса).
+    """
+    view_class = getattr(view, 'view_class', None) or getattr(view, 'cls', None)
+    return getattr(view_class, 'replica_methods', ())
+
+
+class ReplicaRouter:
+    """
+    Без настроенного алиаса replica (DATABASE_REPLICA_URL) все запросы идут в default.
+    """
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and replica_available():
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика содержит те же данные, что и основная база
+        return True
@@ -0,0 +1,230 @@
+"""
+Полнотекстовый поиск по мероприятиям, задачам, проектам и профилям.
+
+Текст объектов приводится к основам слов (stemmer.terms) и хранится в SearchEntry.
+Полнотекстовый индекс над SearchEntry строит бэкенд базы данных: FTS5 в SQLite,
+GIN-индекс по tsvector в PostgreSQL; для остальных баз используется поиск по LIKE.
+"""
+from django.apps import apps as global_apps
+from django.db import connection
+from django.db.models import Q
+
+from .stemmer import terms
+
+# Тип объекта -> (приложение, модель, поле заголовка, поля текста)
+SEARCH_SOURCES = {
+    'event': ('user_account', 'Event', 'title', ('description',)),
+    'task': ('user_account', 'Tasks', 'task', ('description',)),
+    'project': ('project', 'Project', 'title', ('description',)),
+    'profile': ('user_account', 'UserProfile', 'full_name', ('commission', 'status', 'email')),
+}
+BATCH_SIZE = 500
+
+
+def get_kind(model):
+    for kind, (app_label, model_name, _, _) in SEARCH_SOURCES.items():
+        if model._meta.app_label == app_label and model._meta.object_name == model_name:
+            return kind
+    return None
+
+
+def indexed_fields(kind):
+    _, _, title_field, text_fields = SEARCH_SOURCES[kind]
+    return (title_field, *text_fields)
+
+
+def build_entries(kind, objects, entry_model=None):
+    """
+    Возвращает несохраненные записи индекса для объектов одного типа.
+    """
+    entry_model = entry_model or global_apps.get_model('user_account', 'SearchEntry')
+    _, _, title_field, text_fields = SEARCH_SOURCES[kind]
+    entries = []
+    for obj in objects:
+        title = getattr(obj, title_field) or ''
+        text = ' '.join(getattr(obj, field) or '' for field in text_fields)
+        entries.append(entry_model(
+            kind=kind,
+            object_id=obj.pk,
+            title=title[:255],
+            document_title=' '.join(terms(title)),
+            document=' '.join(terms(text)),
+        ))
+    return entries
+
+
+def save_entries(entries, entry_model=None):
+    entry_model = entry_model or global_apps.get_model('user_account', 'SearchEntry')
+    entry_model.objects.bulk_create(
+        entries,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['title', 'document_title', 'document'],
+    )
+
+
+def index_objects(kind, objects):
+    """
+    Добавляет или обновляет записи индекса одним запросом.
+    """
+    entries = build_entries(kind, objects)
+    if entries:
+        save_entries(entries)
+
+
+def remove_objects(kind, object_ids):
+    SearchEntry = global_apps.get_model('user_account', 'SearchEntry')
+    SearchEntry.objects.filter(kind=kind, object_id__in=object_ids).delete()
+
+
+def rebuild_index(apps=global_apps, kinds=None):
+    """
+    Полностью перестраивает индекс для указанных типов (по умолчанию - для всех).
+
+    Returns:
+        int: Количество проиндексированных объектов
+    """
+    SearchEntry = apps.get_model('user_account', 'SearchEntry')
+    kinds = kinds or list(SEARCH_SOURCES)
+    SearchEntry.objects.filter(kind__in=kinds).delete()
+    total = 0
+    for kind in kinds:
+        app_label, model_name, _, _ = SEARCH_SOURCES[kind]
+        objects = apps.get_model(app_label, model_name).objects.only(*indexed_fields(kind))
+        batch = []
+        for obj in objects.iterator(chunk_size=BATCH_SIZE):
+            batch.append(obj)
+            if len(batch) == BATCH_SIZE:
+                save_entries(build_entries(kind, batch, SearchEntry), SearchEntry)
+                total += len(batch)
+                batch = []
+        if batch:
+            save_entries(build_entries(kind, batch, SearchEntry), SearchEntry)
+            total += len(batch)
+    return total
+
+
+class FallbackBackend:
+    """
+    Поиск без полнотекстового индекса: все термы должны встречаться в тексте записи.
+    """
+    def install(self, schema_editor):
+        pass
+
+    def uninstall(self, schema_editor):
+        pass
+
+    def search(self, query_terms, kinds, limit, offset):
+        SearchEntry = global_apps.get_model('user_account', 'SearchEntry')
+        entries = SearchEntry.objects.filter(kind__in=kinds)
+        for term in query_terms:
+            entries = entries.filter(Q(document_title__contains=term) | Q(document__contains=term))
+        return list(entries.order_by('id').values('kind', 'object_id', 'title')[offset:offset + limit])
+
+
+class SQLiteBackend:
+    """
+    Внешняя таблица FTS5 над SearchEntry, синхронизируемая триггерами.
+    Результаты ранжируются по BM25, совпадения в заголовке весят больше.
+    """
+    table = 'user_account_searchentry'
+    fts_table = 'user_account_searchentry_fts'
+
+    def install(self, schema_editor):
+        statements = [
+            f"CREATE VIRTUAL TABLE {self.fts_table} USING fts5("
+            f"document_title, document, content='{self.table}', content_rowid='id', tokenize='unicode61')",
+            f"CREATE TRIGGER {self.fts_table}_ai AFTER INSERT ON {self.table} BEGIN "
+            f"INSERT INTO {self.fts_table}(rowid, document_title, document) "
+            f"VALUES (new.id, new.document_title, new.document); END",
+            f"CREATE TRIGGER {self.fts_table}_ad AFTER DELETE ON {self.table} BEGIN "
+            f"INSERT INTO {self.fts_table}({self.fts_table}, rowid, document_title, document) "
+            f"VALUES ('delete', old.id, old.document_title, old.document); END",
+            f"CREATE TRIGGER {self.fts_table}_au AFTER UPDATE ON {self.table} BEGIN "
+            f"INSERT INTO {self.fts_table}({self.fts_table}, rowid, document_title, document) "
+            f"VALUES ('delete', old.id, old.document_title, old.document); "
+            f"INSERT INTO {self.fts_table}(rowid, document_title, document) "
+            f"VALUES (new.id, new.document_title, new.document); END",
+            f"INSERT INTO {self.fts_table}({self.fts_table}) VALUES ('rebuild')",
+        ]
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    def uninstall(self, schema_editor):
+        for trigger in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {self.fts_table}_{trigger}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {self.fts_table}")
+
+    def search(self, query_terms, kinds, limit, offset):
+        # Термы состоят только из символов \w, поэтому их можно заключить в кавычки как есть
+        match = ' '.join(f'"{term}"*' for term in query_terms)
+        placeholders = ', '.join(['%s'] * len(kinds))
+        sql = (
+            f"SELECT e.kind, e.object_id, e.title FROM {self.fts_table} "
+            f"JOIN {self.table} e ON e.id = {self.fts_table}.rowid "
+            f"WHERE {self.fts_table} MATCH %s AND e.kind IN ({placeholders}) "
+            f"ORDER BY bm25({self.fts_table}, 10.0, 1.0), e.id LIMIT %s OFFSET %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [match, *kinds, limit, offset])
+            return [{'kind': kind, 'object_id': object_id, 'title': title} for kind, object_id, title in cursor.fetchall()]
+
+
+class PostgresBackend:
+    """
+    GIN-индекс по tsvector заголовка (вес A) и текста (вес B).
+    Основы слов уже получены стеммером, поэтому используется конфигурация simple.
+    """
+    table = 'user_account_searchentry'
+    index = 'user_account_searchentry_tsv'
+    vector = (
+        "(setweight(to_tsvector('simple'::regconfig, document_title), 'A') || "
+        "setweight(to_tsvector('simple'::regconfig, document), 'B'))"
+    )
+
+    def install(self, schema_editor):
+        schema_editor.execute(f"CREATE INDEX {self.index} ON {self.table} USING GIN ({self.vector})")
+
+    def uninstall(self, schema_editor):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {self.index}")
+
+    def search(self, query_terms, kinds, limit, offset):
+        query = ' & '.join(f'{term}:*' for term in query_terms)
+        placeholders = ', '.join(['%s'] * len(kinds))
+        sql = (
+            f"SELECT kind, object_id, title FROM {self.table}, to_tsquery('simple'::regconfig, %s) query "
+            f"WHERE {self.vector} @@ query AND kind IN ({placeholders}) "
+            f"ORDER BY ts_rank({self.vector}, query) DESC, id LIMIT %s OFFSET %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [query, *kinds, limit, offset])
+            return [{'kind': kind, 'object_id': object_id, 'title': title} for kind, object_id, title in cursor.fetchall()]
+
+
+BACKENDS = {
+    'sqlite': SQLiteBackend,
+    'postgresql': PostgresBackend,
+}
+
+
+def get_backend(db_connection=connection):
+    return BACKENDS.get(db_connection.vendor, FallbackBackend)()
+
+
+def search(query, kinds=None, limit=20, offset=0):
+    """
+    Ищет объекты по строке запроса. Каждое слово запроса ищется по префиксу своей основы.
+
+    Args:
+        query: Строка запроса
+        kinds: Типы объектов из SEARCH_SOURCES (по умолчанию - все)
+        limit, offset: Границы страницы результатов
+
+    Returns:
+        list: Словари {kind, object_id, title} в порядке релевантности
+    """
+    query_terms = terms(query)
+    if not query_terms:
+        return []
+    return get_backend().search(query_terms, list(kinds or SEARCH_SOURCES), limit, offset)
@@ -1,8 +1,173 @@
 from rest_framework import serializers
 from .models import UserProfile, Event, Tasks
 from django.contrib.auth.models import User
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from . import search
+from .cache import bump_version
+from . import metrics
 
-class UserProfileSerializer(serializers.ModelSerializer):
+def get_field_options(request, compact=False):
+    """
+    Возвращает параметры DynamicFieldsMixin из запроса (?fields=id,title&expand=tasks).
+
+    Args:
+        compact: Компактный режим по умолчанию (для списков)
+    """
+    def split(name):
+        value = request.query_params.get(name)
+        return [item.strip() for item in value.split(',') if item.strip()] if value else None
+
+    return {'fields': split('fields'), 'expand': split('expand') or (), 'compact': compact}
+
+
+class DynamicFieldsMixin:
+    """
+    Разреженный набор полей и раскрытие тяжелых полей.
+
+    fields: Выводить только эти поля
+    expand: Поля из Meta.expandable_fields, которые нужно вывести в компактном режиме
+    compact: Не выводить Meta.expandable_fields, если они не запрошены явно
+    """
+    def __init__(self, *args, fields=None, expand=(), compact=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields:
+            allowed = set(fields)
+        else:
+            allowed = set(self.fields)
+            if compact:
+                allowed -= set(getattr(self.Meta, 'expandable_fields', ())) - set(expand)
+        for name in set(self.fields) - allowed:
+            self.fields.pop(name)
+
+    def get_sources(self):
+        """
+        Возвращает атрибуты модели, которые читают оставшиеся поля (для выбора prefetch_related).
+        """
+        return {field.source.split('.')[0] for field in self.fields.values()}
+
+    def get_only_fields(self, extra=()):
+        """
+        Возвращает колонки модели, которые нужны оставшимся полям (для only()).
+
+        Args:
+            extra: Дополнительные поля, например поля сортировки
+        """
+        columns = set(extra)
+        for source in self.get_sources():
+            try:
+                field = self.Meta.model._meta.get_field(source)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and not field.many_to_many:
+                columns.add(field.name)
+        return columns
+
+
+class ValuesSerializerMixin:
+    """
+    Быстрый путь для списков только для чтения: данные строятся из строк .values()
+    без создания экземпляров моделей.
+
+    Применим, если все выводимые поля - колонки модели (включая ID внешних ключей)
+    или списки ID связей "многие ко многим" и обратных связей. ID связей загружаются
+    одним запросом на связь.
+    """
+    VALUE_FIELDS = (
+        serializers.IntegerField, serializers.CharField, serializers.BooleanField,
+        serializers.ChoiceField, serializers.DateField, serializers.DateTimeField,
+        serializers.FloatField, serializers.DecimalField,
+    )
+
+    def get_values_plan(self):
+        """
+        Возвращает [(имя поля, источник, тип)] или None, если быстрый путь неприменим.
+        Тип: 'column' - колонка, 'file' - файл, 'pk' - ID внешнего ключа, 'many' - список ID связи.
+        """
+        plan = []
+        meta = self.Meta.model._meta
+        for field in self._readable_fields:
+            try:
+                model_field = meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+            if isinstance(field, serializers.ManyRelatedField):
+                if not isinstance(field.child_relation, serializers.PrimaryKeyRelatedField):
+                    return None
+                if not (model_field.many_to_many or model_field.one_to_many):
+                    return None
+                plan.append((field.field_name, field.source, 'many'))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField) and model_field.concrete and model_field.is_relation:
+                plan.append((field.field_name, field.source, 'pk'))
+            elif isinstance(field, serializers.FileField) and isinstance(model_field, models.FileField):
+                plan.append((field.field_name, field.source, 'file'))
+            elif isinstance(field, self.VALUE_FIELDS) and model_field.concrete and not model_field.is_relation:
+                plan.append((field.field_name, field.source, 'column'))
+            else:
+                return None
+        return plan
+
+    def values_queryset(self, queryset, extra=()):
+        """
+        Возвращает queryset.values() для быстрого пути или None, если он неприменим.
+
+        Args:
+            extra: Дополнительные колонки (например, поля курсорной сортировки)
+        """
+        plan = self.get_values_plan()
+        if plan is None:
+            return None
+        columns = {'pk', *extra}
+        columns.update(source for _, source, kind in plan if kind != 'many')
+        return queryset.values(*columns)
+
+    def _related_ids(self, source, object_ids):
+        field = self.Meta.model._meta.get_field(source)
+        if field.many_to_many:
+            through = field.remote_field.through
+            rows = through.objects.filter(**{f'{field.m2m_column_name()}__in': object_ids}).order_by('pk')
+            rows = rows.values_list(field.m2m_column_name(), field.m2m_reverse_name())
+        else:
+            rows = field.related_model.objects.filter(**{f'{field.field.name}__in': object_ids}).order_by('pk')
+            rows = rows.values_list(field.field.attname, 'pk')
+        related = {}
+        for object_id, related_id in rows:
+            related.setdefault(object_id, []).append(related_id)
+        return related
+
+    def values_data(self, rows):
+        """
+        Строит данные ответа из строк values_queryset() в формате to_representation().
+        """
+        with metrics.timer('serializer_duration_seconds'):
+            return self._values_data(rows)
+
+    def _values_data(self, rows):
+        plan = self.get_values_plan()
+        object_ids = [row['pk'] for row in rows]
+        related = {
+            source: self._related_ids(source, object_ids)
+            for _, source, kind in plan if kind == 'many' and object_ids
+        }
+        data = []
+        for row in rows:
+            item = {}
+            for name, source, kind in plan:
+                if kind == 'many':
+                    item[name] = related[source].get(row['pk'], [])
+                elif kind == 'pk' or row[source] is None:
+                    item[name] = row[source]
+                elif kind == 'file':
+                    # FieldFile без экземпляра модели достаточно для построения URL
+                    model_field = self.Meta.model._meta.get_field(source)
+                    item[name] = self.fields[name].to_representation(model_field.attr_class(None, model_field, row[source]))
+                else:
+                    item[name] = self.fields[name].to_representation(row[source])
+            data.append(item)
+        return data
+
+
+class UserProfileSerializer(DynamicFieldsMixin, ValuesSerializerMixin, serializers.ModelSerializer):
     status = serializers.CharField(
         required=False,
         allow_blank=True,
@@ -23,6 +188,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         model = UserProfile
         fields = ['id', 'user', 'username', 'password', 'full_name', 'date_of_birth', 'commission', 'profile_photo', 'access_level', 'status', 'number_phone', 'email', 'adress']
         read_only_fields = ['id', 'user']
+        expandable_fields = ['date_of_birth', 'adress']
 
     def create(self, validated_data):
         username = validated_data.pop('username')
@@ -43,7 +209,64 @@ class UserProfileSerializer(serializers.ModelSerializer):
         
         return profile
 
-class TasksSerializer(serializers.ModelSerializer):
+class TasksListSerializer(serializers.ListSerializer):
+    """
+    Сериализатор списка задач для массовых операций.
+
+    Создание и обновление выполняются через bulk_create/bulk_update, исполнители
+    записываются в промежуточную таблицу одним INSERT. Сигналы моделей при этом
+    не отправляются, поэтому кеш мероприятий и поисковый индекс обновляются явно.
+    Вызывать внутри transaction.atomic().
+    """
+    def run_child_validation(self, data):
+        # При обновлении instance - словарь {id: задача}, каждый элемент проверяется со своей задачей
+        if isinstance(self.instance, dict):
+            self.child.instance = self.instance.get(data.get('id')) if isinstance(data, dict) else None
+            if self.child.instance is None:
+                raise serializers.ValidationError({'id': ['Task not found.']})
+        return super().run_child_validation(data)
+
+    def _set_executors(self, tasks, executors):
+        Through = Tasks.executor.through
+        Through.objects.filter(tasks_id__in=[task.pk for task in tasks]).delete()
+        Through.objects.bulk_create([
+            Through(tasks_id=task.pk, user_id=user.pk)
+            for task, users in zip(tasks, executors)
+            for user in users
+        ])
+        for task, users in zip(tasks, executors):
+            # Обновляем кеш prefetch, чтобы ответ содержал новых исполнителей без дополнительных запросов
+            task._prefetched_objects_cache = {'executor': list(users)}
+
+    def create(self, validated_data):
+        executors = [item.pop('executor', []) for item in validated_data]
+        tasks = Tasks.objects.bulk_create([Tasks(**item) for item in validated_data])
+        self._set_executors(tasks, executors)
+        search.index_objects('task', tasks)
+        bump_version('event', [task.event_id for task in tasks])
+        return tasks
+
+    def update(self, instances, validated_data):
+        tasks = [instances[item['id']] for item in self.initial_data]
+        event_ids = [task.event_id for task in tasks]
+        fields, with_executors = set(), []
+        for task, item in zip(tasks, validated_data):
+            if 'executor' in item:
+                with_executors.append((task, item.pop('executor')))
+            for field, value in item.items():
+                setattr(task, field, value)
+                fields.add(field)
+        if fields:
+            Tasks.objects.bulk_update(tasks, list(fields))
+        if with_executors:
+            self._set_executors(*zip(*with_executors))
+        if fields & set(search.indexed_fields('task')):
+            search.index_objects('task', tasks)
+        bump_version('event', event_ids + [task.event_id for task in tasks])
+        return tasks
+
+
+class TasksSerializer(DynamicFieldsMixin, ValuesSerializerMixin, serializers.ModelSerializer):
     creator = serializers.HiddenField(default=serializers.CurrentUserDefault())
     executor = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), many=True, required=False)
     event = serializers.PrimaryKeyRelatedField(queryset=Event.objects.all())
@@ -52,8 +275,10 @@ class TasksSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tasks
         fields = ['id', 'task', 'description', 'event', 'deadline', 'creator', 'executor', 'status', 'is_past']
+        list_serializer_class = TasksListSerializer
+        expandable_fields = ['description']
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(DynamicFieldsMixin, ValuesSerializerMixin, serializers.ModelSerializer):
     organizers = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), many=True, required=False)
     participants = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), many=True, required=False)
     is_past = serializers.BooleanField()
@@ -63,6 +288,7 @@ class EventSerializer(serializers.ModelSerializer):
     class Meta:
         model = Event
         fields = ['id', 'title', 'description', 'date', 'organizers', 'files', 'tasks', 'participants', 'projects', 'is_past', 'is_cancelled']
+        expandable_fields = ['description', 'tasks']
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,97 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from project.models import Project
+
+from . import search
+from .cache import bump_version
+from .models import Event, EventMembership, Tasks, UserProfile
+
+
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_event(sender, instance, **kwargs):
+    bump_version('event', [instance.pk])
+
+
+@receiver(m2m_changed, sender=Event.organizers.through)
+@receiver(m2m_changed, sender=Event.participants.through)
+@receiver(m2m_changed, sender=Event.projects.through)
+def invalidate_event_relations(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        bump_version('event', [instance.pk])
+    elif pk_set is not None:
+        bump_version('event', pk_set)
+    else:
+        # clear() со стороны пользователя или проекта: затронутые мероприятия неизвестны
+        bump_version('event')
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=User)
+def invalidate_events_on_cascade(sender, instance, **kwargs):
+    # Каскадное удаление строк связей (организаторы, участники, проекты мероприятия)
+    # не отправляет m2m_changed, а затронутые мероприятия после удаления уже неизвестны
+    bump_version('event')
+
+
+@receiver([post_save, post_delete], sender=Tasks)
+def invalidate_task_event(sender, instance, **kwargs):
+    # Задача встроена в ответ мероприятия; при переносе задачи сбрасываем и прежнее мероприятие
+    bump_version('event', [instance.event_id, getattr(instance, '_loaded_event_id', None)])
+
+
+@receiver(m2m_changed, sender=Tasks.executor.through)
+def invalidate_task_executors(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        bump_version('event', [instance.event_id])
+    elif pk_set is not None:
+        bump_version('event', Tasks.objects.filter(pk__in=pk_set).values_list('event_id', flat=True))
+    else:
+        bump_version('event')
+
+
+@receiver(m2m_changed, sender=Event.organizers.through)
+@receiver(m2m_changed, sender=Event.participants.through)
+def sync_event_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Поддерживает EventMembership в соответствии с организаторами и участниками мероприятий.
+    """
+    role = EventMembership.ROLE_ORGANIZER if sender is Event.organizers.through else EventMembership.ROLE_PARTICIPANT
+    # Прямая связь: instance - мероприятие, pk_set - пользователи; обратная - наоборот
+    owner = 'user_id' if reverse else 'event_id'
+    other = 'event_id' if reverse else 'user_id'
+
+    if action == 'post_add':
+        EventMembership.objects.bulk_create(
+            [EventMembership(**{owner: instance.pk, other: pk, 'role': role}) for pk in pk_set],
+            ignore_conflicts=True,
+        )
+    elif action == 'post_remove':
+        EventMembership.objects.filter(**{owner: instance.pk, f'{other}__in': pk_set, 'role': role}).delete()
+    elif action == 'post_clear':
+        EventMembership.objects.filter(**{owner: instance.pk, 'role': role}).delete()
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Tasks)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=UserProfile)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    kind = search.get_kind(sender)
+    # Сохранение только служебных полей (is_past, path, ...) не меняет текст записи
+    if update_fields is not None and not set(update_fields) & set(search.indexed_fields(kind)):
+        return
+    search.index_objects(kind, [instance])
+
+
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Tasks)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=UserProfile)
+def remove_from_search_index(sender, instance, **kwargs):
+    search.remove_objects(search.get_kind(sender), [instance.pk])
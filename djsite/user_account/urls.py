@@ -6,12 +6,19 @@ from django.conf.urls.static import static
 
 urlpatterns = [
     path('api/users/', views.UserListView.as_view(), name='api_user_list'),
+    path('api/users/import/', views.UserImportView.as_view(), name='api_user_import'),
     path('api/users/<int:user_id>/', views.UserListView.as_view(), name='api_user_detail'),
     path('api/profile/<int:user_id>/', views.ProfileView.as_view(), name='api_profile'),
     path('api/profile_view/<int:user_id>/', views.OtherProfileView.as_view(), name='api_other_profile'),
     path('api/events/', views.EventListCreateView.as_view(), name='api_events'),
     path('api/event/<int:event_id>/', views.EventDetailView.as_view(), name='api_event_detail'),
+    path('api/calendar/', views.CalendarView.as_view(), name='api_calendar'),
+    path('api/export/<str:kind>.<str:fmt>', views.ExportView.as_view(), name='api_export'),
+    path('api/metrics/', views.MetricsView.as_view(), name='api_metrics'),
+    path('api/metrics/prometheus/', views.PrometheusMetricsView.as_view(), name='api_metrics_prometheus'),
+    path('api/search/', views.SearchView.as_view(), name='api_search'),
     path('api/tasks/', views.TaskListCreateView.as_view(), name='api_tasks'),
+    path('api/tasks/bulk/', views.TaskBulkView.as_view(), name='api_tasks_bulk'),
     path('api/tasks/<int:task_id>/', views.TaskDetailView.as_view(), name='api_task_detail'),
     path('token/', views.CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', jwt_views.TokenRefreshView.as_view(), name ='token_refresh'),
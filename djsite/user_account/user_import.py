@@ -0,0 +1,133 @@
+"""
+Массовый импорт пользователей из CSV или JSON.
+
+Все строки проверяются до записи, пароли хешируются в пуле процессов,
+User и UserProfile создаются через bulk_create в одной транзакции.
+"""
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from . import search
+from .models import UserProfile
+from .serializers import UserProfileSerializer
+
+# Число процессов для хеширования паролей; при меньшем числе строк пул не создается
+HASH_WORKERS = getattr(settings, 'USER_IMPORT_HASH_WORKERS', os.cpu_count() or 1)
+POOL_THRESHOLD = getattr(settings, 'USER_IMPORT_POOL_THRESHOLD', 20)
+
+
+class UserImportError(Exception):
+    """
+    Ошибка импорта; errors - список ошибок по строкам [{row, errors}].
+    """
+    def __init__(self, errors):
+        super().__init__(f'{len(errors)} invalid rows')
+        self.errors = errors
+
+
+def parse_rows(content, file_name=''):
+    """
+    Разбирает CSV или JSON (список объектов) в список словарей.
+    Пустые значения CSV считаются отсутствующими.
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    if file_name.endswith('.json') or content.lstrip().startswith('['):
+        rows = json.loads(content)
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError('JSON must be a list of objects.')
+        return rows
+    return [
+        {key: value for key, value in row.items() if key and value not in ('', None)}
+        for row in csv.DictReader(io.StringIO(content))
+    ]
+
+
+def validate_rows(rows):
+    """
+    Проверяет все строки и возвращает проверенные данные или выбрасывает UserImportError.
+    Уникальность логинов проверяется одним запросом.
+    """
+    validated, errors = [], []
+    for index, row in enumerate(rows):
+        serializer = UserProfileSerializer(data=row)
+        if serializer.is_valid():
+            data = dict(serializer.validated_data)
+            # Та же нормализация, что в User.objects.create_user
+            data['username'] = User.normalize_username(data['username'])
+            data['email'] = User.objects.normalize_email(data.get('email', ''))
+            validated.append(data)
+        else:
+            errors.append({'row': index, 'errors': serializer.errors})
+            validated.append(None)
+
+    usernames = [data['username'] for data in validated if data]
+    existing = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+    seen = set()
+    for index, data in enumerate(validated):
+        if not data:
+            continue
+        if data['username'] in existing or data['username'] in seen:
+            errors.append({'row': index, 'errors': {'username': ['A user with that username already exists.']}})
+        seen.add(data['username'])
+
+    if errors:
+        raise UserImportError(sorted(errors, key=lambda error: error['row']))
+    return validated
+
+
+def _setup_worker():
+    # При запуске через spawn/forkserver процесс пула не наследует настроенный Django
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def hash_passwords(passwords, workers=HASH_WORKERS):
+    """
+    Хеширует пароли; при большом количестве - параллельно в пуле процессов.
+    """
+    if workers <= 1 or len(passwords) < POOL_THRESHOLD:
+        return [make_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_setup_worker) as executor:
+        return list(executor.map(make_password, passwords, chunksize=chunksize))
+
+
+def import_users(rows, workers=HASH_WORKERS):
+    """
+    Создает пользователей и их профили.
+
+    Args:
+        rows: Список словарей с полями UserProfileSerializer
+        workers: Число процессов для хеширования паролей
+
+    Returns:
+        list: Созданные профили в порядке rows
+
+    Raises:
+        UserImportError: Если хотя бы одна строка некорректна (ничего не создается)
+    """
+    validated = validate_rows(rows)
+    passwords = hash_passwords([data.pop('password') for data in validated], workers=workers)
+
+    with transaction.atomic():
+        users = User.objects.bulk_create([
+            User(username=data.pop('username'), password=password, email=data.get('email', ''))
+            for data, password in zip(validated, passwords)
+        ])
+        profiles = UserProfile.objects.bulk_create([
+            UserProfile(user=user, **data) for user, data in zip(users, validated)
+        ])
+        # bulk_create не отправляет сигналы, поэтому поисковый индекс обновляется явно
+        search.index_objects('profile', profiles)
+    return profiles
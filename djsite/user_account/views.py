@@ -3,15 +3,34 @@ from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
+from rest_framework.exceptions import APIException
 from rest_framework.decorators import api_view
-from .serializers import UserProfileSerializer, EventSerializer, TasksSerializer
+from .serializers import UserProfileSerializer, EventSerializer, TasksSerializer, get_field_options
 from .models import UserProfile, Event, Tasks
 # from django.contrib.auth.models import User
 from rest_framework.permissions import IsAuthenticated
 # from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
+from django.db import transaction
+from django.utils import timezone
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
+from .pagination import CursorPaginationMixin
+from .async_views import AsyncAPIView
+from asgiref.sync import sync_to_async
+from .permissions import IsViewer, IsAdmin
+from .cache import cache_response
+from .filters import filter_tasks, order_tasks
+from . import search
+from . import export
+from . import metrics
+from django.http import HttpResponse
+from .user_import import import_users, parse_rows, UserImportError
+from django.http import StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+from .utils import get_month_dates, get_week_dates, get_day_date
+from datetime import date
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,6 +40,16 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     Расширенный сериализатор для получения JWT токена.
     Добавляет дополнительную информацию о пользователе в токен.
     """
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        # Уровень доступа в claim, чтобы его можно было прочитать без запроса к профилю
+        try:
+            token['access_level'] = user.userprofile.access_level
+        except UserProfile.DoesNotExist:
+            token['access_level'] = None
+        return token
+
     def validate(self, attrs):
         data = super().validate(attrs)
 
@@ -43,66 +72,64 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
     
 
-class ProfileView(APIView):
+class ProfileView(AsyncAPIView):
     """
-    API представление для работы с профилем пользователя.
+    API представление для работы с профилем пользователя (асинхронное).
     
     Методы:
         get: Получение информации о профиле пользователя и связанных мероприятиях
         put: Обновление информации профиля пользователя
     """
     permission_classes = [IsAuthenticated]
+    replica_methods = ('GET', 'HEAD')
     
-    def get(self, request, user_id):
+    async def get(self, request, user_id):
         try:
-            profile = UserProfile.objects.get(user_id=user_id)
+            profile = await UserProfile.objects.aget(user_id=user_id)
         except UserProfile.DoesNotExist:
             return Response({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
         
-        organized_events = Event.objects.filter(organizers=request.user)
-        participating_events = Event.objects.filter(participants=request.user)
+        # Связи загружаются prefetch_related, сериализация не обращается к базе
+        events = [event async for event in Event.objects.for_api().for_user(request.user)]
 
-        event_serializer = EventSerializer(organized_events.union(participating_events), many=True)
+        event_serializer = EventSerializer(events, many=True)
 
         serializer = UserProfileSerializer(profile)
         return Response({
-            'profile': serializer.data,
-            'events': event_serializer.data
+            'profile': metrics.serializer_data(serializer),
+            'events': metrics.serializer_data(event_serializer)
         })
 
-    def put(self, request, user_id):
+    async def put(self, request, user_id):
+        return await sync_to_async(self.update_profile)(request, user_id)
+
+    def update_profile(self, request, user_id):
         try:
-            logger.info(f'Начало обновления профиля для пользователя {user_id}')
-            logger.info(f'Полученные данные: {request.data}')
-            logger.info(f'Полученные файлы: {request.FILES}')
-            
+            # Тело запроса не логируется: в нем могут быть пароль и персональные данные
+            logger.debug('Обновление профиля пользователя %s, поля: %s', user_id, sorted(request.data.keys()))
+
             profile = UserProfile.objects.get(user_id=user_id)
-            logger.info(f'Найден профиль: {profile}')
-            
+
             profile_photo_path = request.data.get('profile_photos', None)
-            logger.info(f'Путь к фото из запроса: {profile_photo_path}')
 
             if profile_photo_path:
                 file_path = os.path.join(settings.MEDIA_ROOT, profile_photo_path.lstrip('/'))
-                logger.info(f'Полный путь к файлу: {file_path}')
-                logger.info(f'Существует ли файл: {os.path.exists(file_path)}')
 
                 if os.path.exists(file_path):
                     profile.profile_photo = profile_photo_path
-                    logger.info(f'Фото обновлено: {profile.profile_photo}')
                 else:
-                    logger.error(f'Файл не найден по пути: {file_path}')
+                    logger.warning('Файл фото профиля не найден: %s', file_path)
                     return Response({"error": "File not found"}, status=status.HTTP_400_BAD_REQUEST)
 
             serializer = UserProfileSerializer(profile, data=request.data, partial=True)
             if serializer.is_valid():
                 serializer.save()
-                logger.info(f'Профиль успешно обновлен: {serializer.data}')
+                logger.info('Профиль пользователя %s обновлен', user_id)
                 return Response(serializer.data)
-            logger.error(f'Ошибки валидации: {serializer.errors}')
+            logger.info('Ошибки валидации профиля пользователя %s: %s', user_id, serializer.errors)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            logger.error(f'Ошибка при обновлении профиля: {str(e)}', exc_info=True)
+            logger.exception('Ошибка при обновлении профиля пользователя %s', user_id)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
 
@@ -115,37 +142,29 @@ class OtherProfileView(APIView):
         get: Получение информации о профиле другого пользователя
         put: Обновление комиссии и статуса пользователя
     """
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, IsAdmin]
+    replica_methods = ('GET', 'HEAD')
 
     def get(self, request, user_id):
         try:
-            current_profile = UserProfile.objects.get(user=request.user)
-            if current_profile.access_level < 3:
-                return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
-
             profile = UserProfile.objects.get(user_id=user_id)
         except UserProfile.DoesNotExist:
             return Response({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
 
         user = profile.user
-        organized_events = Event.objects.filter(organizers=user)
-        participating_events = Event.objects.filter(participants=user)
+        events = Event.objects.for_api().for_user(user)
 
-        event_serializer = EventSerializer(organized_events.union(participating_events), many=True)
+        event_serializer = EventSerializer(events, many=True)
 
         profile_serializer = UserProfileSerializer(profile)
 
         return Response({
-            'profile': profile_serializer.data,
-            'events': event_serializer.data
+            'profile': metrics.serializer_data(profile_serializer),
+            'events': metrics.serializer_data(event_serializer)
         })
     
     def put(self, request, user_id):
         try:
-            current_profile = UserProfile.objects.get(user=request.user)
-            if current_profile.access_level  < 3:
-                return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
-
             profile = UserProfile.objects.get(user_id=user_id)
         except UserProfile.DoesNotExist:
             return Response({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -164,33 +183,37 @@ class OtherProfileView(APIView):
     
 
 
-class UserListView(APIView):
+class UserListView(CursorPaginationMixin, APIView):
     """
     API представление для работы со списком пользователей.
     Доступно только для администраторов (access_level >= 3).
     
     Методы:
-        get: Получение списка всех пользователей
+        get: Получение постраничного списка всех пользователей
+            (компактно; ?fields=id,full_name, ?expand=date_of_birth,adress)
         post: Создание нового пользователя
         delete: Удаление пользователя по ID
     """
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsAdmin.on('POST', 'DELETE')]
 
     def get(self, request):
         try:
-            users = UserProfile.objects.all()
-            serializer = UserProfileSerializer(users, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            options = get_field_options(request, compact=True)
+            fields = UserProfileSerializer(**options)
+            rows = fields.values_queryset(UserProfile.objects.all(), extra=self.ordering_fields)
+            if rows is not None:
+                return self.get_paginated_response(fields.values_data(self.paginate_queryset(rows)))
+            users = self.paginate_queryset(UserProfile.objects.only(*fields.get_only_fields()))
+            serializer = UserProfileSerializer(users, many=True, **options)
+            return self.get_paginated_response(metrics.serializer_data(serializer))
+        except APIException:
+            # Неверный курсор (404) и параметры (400) обрабатывает DRF
+            raise
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def post(self, request):
         try:
-            # Проверяем уровень доступа
-            current_profile = UserProfile.objects.get(user=request.user)
-            if current_profile.access_level < 3:
-                return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
-
             serializer = UserProfileSerializer(data=request.data)
             if serializer.is_valid():
                 serializer.save()
@@ -201,11 +224,6 @@ class UserListView(APIView):
 
     def delete(self, request, user_id):
         try:
-            # Проверяем уровень доступа
-            current_profile = UserProfile.objects.get(user=request.user)
-            if current_profile.access_level < 3:
-                return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
-
             profile = UserProfile.objects.get(user_id=user_id)
             profile.delete()
             return Response(status=status.HTTP_204_NO_CONTENT)
@@ -215,23 +233,62 @@ class UserListView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class EventListCreateView(APIView):
+class UserImportView(APIView):
+    """
+    API представление массового импорта пользователей.
+    Доступно только для администраторов (access_level >= 3).
+    
+    Методы:
+        post: Создание пользователей и профилей
+            Параметры:
+                users: Список объектов в формате UserProfileSerializer
+                или file: CSV/JSON-файл с теми же полями
+            При ошибке в любой строке ничего не создается, ответ содержит ошибки по строкам
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        try:
+            rows = parse_rows(upload.read(), upload.name) if upload else request.data.get('users')
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({"error": f"Invalid file: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(rows, list) or not rows:
+            return Response({"error": "users must be a non-empty list."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            profiles = import_users(rows)
+        except UserImportError as e:
+            return Response({"errors": e.errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'created': len(profiles),
+            'users': [{'id': profile.user_id, 'profile_id': profile.id, 'username': profile.user.username} for profile in profiles],
+        }, status=status.HTTP_201_CREATED)
+
+
+class EventListCreateView(CursorPaginationMixin, APIView):
     """
     API представление для работы со списком мероприятий.
     
     Методы:
-        get: Получение списка всех мероприятий
+        get: Получение постраничного списка всех мероприятий
+            (компактно; ?fields=id,title,date, ?expand=description,tasks)
         post: Создание нового мероприятия
     """
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsViewer.on('GET')]
+    replica_methods = ('GET', 'HEAD')
+    ordering = ('-date', '-id')
 
     def get(self, request):
-        profile = UserProfile.objects.get(user=request.user)
-        if profile.access_level < 1:  
-            return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
-        events = Event.objects.all()
-        serializer = EventSerializer(events, many=True)
-        return Response(serializer.data)
+        options = get_field_options(request, compact=True)
+        fields = EventSerializer(**options)
+        rows = fields.values_queryset(Event.objects.all(), extra=self.ordering_fields)
+        if rows is not None:
+            return self.get_paginated_response(fields.values_data(self.paginate_queryset(rows)))
+        events = Event.objects.for_api(fields.get_sources()).only(*fields.get_only_fields(extra=['date']))
+        events = self.paginate_queryset(events)
+        serializer = EventSerializer(events, many=True, **options)
+        return self.get_paginated_response(metrics.serializer_data(serializer))
 
     def post(self, request):
         serializer = EventSerializer(data=request.data)
@@ -245,37 +302,42 @@ class EventListCreateView(APIView):
                 event.participants.set(request.data["participants"])
 
             event.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            # Ответ строится по мероприятию с подгруженными связями, а не по сохраненному экземпляру
+            event = Event.objects.for_api().get(pk=event.pk)
+            return Response(EventSerializer(event).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     
-class EventDetailView(APIView):
+class EventDetailView(AsyncAPIView):
     """
-    API представление для работы с отдельным мероприятием.
+    API представление для работы с отдельным мероприятием (асинхронное).
     
     Методы:
-        get: Получение информации о конкретном мероприятии
+        get: Получение информации о конкретном мероприятии (кешируется, поддерживает ETag/If-None-Match
+            и ?fields=)
         put: Обновление информации о мероприятии (только для администраторов)
         delete: Удаление мероприятия (только для администраторов)
     """
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsAdmin.on('PUT', 'DELETE')]
 
-    def get(self, request, event_id):
-        profile = UserProfile.objects.get(user=request.user)
+    @cache_response('event', lookup_kwarg='event_id')
+    async def get(self, request, event_id):
+        options = get_field_options(request)
+        fields = EventSerializer(**options)
         try:
-            event = Event.objects.get(id=event_id)
+            event = await Event.objects.for_api(fields.get_sources()).only(*fields.get_only_fields()).aget(id=event_id)
         except Event.DoesNotExist:
             return Response({"error": "Event not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = EventSerializer(event)
-        return Response(serializer.data)
+        serializer = EventSerializer(event, **options)
+        return Response(metrics.serializer_data(serializer))
 
-    def put(self, request, event_id): 
-        profile = UserProfile.objects.get(user=request.user)
-        if profile.access_level < 3:  
-            return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
+    async def put(self, request, event_id):
+        return await sync_to_async(self.update_event)(request, event_id)
+
+    def update_event(self, request, event_id):
         try:
-            event = Event.objects.get(id=event_id)
+            event = Event.objects.for_api().get(id=event_id)
         except Event.DoesNotExist:
             return Response({"error": "Event not found"}, status=status.HTTP_404_NOT_FOUND)
 
@@ -285,41 +347,204 @@ class EventDetailView(APIView):
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    def delete(self, request, event_id):
-        profile = UserProfile.objects.get(user=request.user)
-        if profile.access_level < 3: 
-            return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
+    async def delete(self, request, event_id):
         try:
-            event = Event.objects.get(id=event_id)
-            event.delete()
-            return Response({"message": "Event deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
+            event = await Event.objects.aget(id=event_id)
         except Event.DoesNotExist:
             return Response({"error": "Event not found"}, status=status.HTTP_404_NOT_FOUND)
+        await event.adelete()
+        return Response({"message": "Event deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
         
 
-class TaskListCreateView(APIView):
+class CalendarView(APIView):
+    """
+    API представление календаря мероприятий и сроков задач.
+    
+    Методы:
+        get: Получение мероприятий и задач, сгруппированных по дням видимого периода
+            Параметры:
+                view: month, week или day (по умолчанию month)
+                date: Любая дата периода в формате YYYY-MM-DD (по умолчанию сегодня)
+    """
+    permission_classes = [IsAuthenticated]
+
+    EVENT_FIELDS = ('id', 'title', 'date', 'is_past', 'is_cancelled')
+    TASK_FIELDS = ('id', 'task', 'event_id', 'deadline', 'status', 'is_past')
+
+    def get_dates(self, view, day):
+        if view == 'month':
+            return [d for d in get_month_dates(day.year, day.month) if d is not None]
+        if view == 'week':
+            return get_week_dates(day)
+        return get_day_date(day)
+
+    def get(self, request):
+        view = request.query_params.get('view', 'month')
+        if view not in ('month', 'week', 'day'):
+            return Response({"error": "view must be month, week or day."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            day = date.fromisoformat(request.query_params['date']) if request.query_params.get('date') else timezone.localdate()
+        except ValueError:
+            return Response({"error": "date must be in YYYY-MM-DD format."}, status=status.HTTP_400_BAD_REQUEST)
+
+        dates = self.get_dates(view, day)
+        start, end = dates[0], dates[-1]
+        days = {d: {'date': d, 'events': [], 'tasks': []} for d in dates}
+
+        # По одному запросу по диапазону индексированных Event.date и Tasks.deadline
+        for event in Event.objects.filter(date__range=(start, end)).order_by('date', 'id').values(*self.EVENT_FIELDS):
+            days[event['date']]['events'].append(event)
+        tasks = Tasks.objects.filter(deadline__range=(start, end)).order_by('deadline', 'id').values(*self.TASK_FIELDS)
+        for task in tasks:
+            days[task['deadline']]['tasks'].append(task)
+
+        return Response({'view': view, 'start': start, 'end': end, 'days': list(days.values())})
+
+
+class SearchView(APIView):
+    """
+    API представление полнотекстового поиска по мероприятиям, задачам, проектам и профилям.
+    
+    Методы:
+        get: Поиск с ранжированием по релевантности
+            Параметры:
+                q: Строка запроса (русские слова ищутся по основе)
+                type: Типы объектов через запятую (event, task, project, profile)
+                page_size: Размер страницы
+                offset: Смещение от начала результатов
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "q is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        kinds = request.query_params.get('type')
+        kinds = kinds.split(',') if kinds else list(search.SEARCH_SOURCES)
+        if not set(kinds) <= set(search.SEARCH_SOURCES):
+            return Response({"error": "Unsupported type."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            page_size = min(int(request.query_params.get('page_size', settings.REST_FRAMEWORK['PAGE_SIZE'])), settings.API_MAX_PAGE_SIZE)
+            offset = int(request.query_params.get('offset', 0))
+        except ValueError:
+            return Response({"error": "page_size and offset must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        if page_size < 1 or offset < 0:
+            return Response({"error": "page_size must be positive and offset non-negative."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Лишняя запись показывает, есть ли следующая страница, без подсчета всех совпадений
+        results = search.search(query, kinds, limit=page_size + 1, offset=offset)
+        url = request.build_absolute_uri()
+        next_url = replace_query_param(url, 'offset', offset + page_size) if len(results) > page_size else None
+        previous_url = None
+        if offset:
+            previous_offset = max(offset - page_size, 0)
+            previous_url = replace_query_param(url, 'offset', previous_offset) if previous_offset else remove_query_param(url, 'offset')
+
+        return Response({
+            'next': next_url,
+            'previous': previous_url,
+            'results': [
+                {'type': item['kind'], 'id': item['object_id'], 'title': item['title']}
+                for item in results[:page_size]
+            ],
+        })
+
+
+class ExportView(APIView):
+    """
+    API представление потоковой выгрузки мероприятий и задач.
+    
+    Методы:
+        get: Выгрузка в CSV или JSON Lines (/api/export/events.csv, /api/export/tasks.jsonl)
+            Выгрузка задач принимает те же фильтры, что и список задач
+    """
+    permission_classes = [IsAuthenticated, IsViewer]
+
+    CONTENT_TYPES = {
+        'csv': 'text/csv; charset=utf-8',
+        'jsonl': 'application/x-ndjson',
+    }
+
+    def get(self, request, kind, fmt):
+        if kind not in ('events', 'tasks') or fmt not in self.CONTENT_TYPES:
+            return Response({"error": "Unsupported export."}, status=status.HTTP_404_NOT_FOUND)
+
+        if kind == 'events':
+            rows, columns = export.event_rows(), export.EVENT_COLUMNS
+        else:
+            rows, columns = export.task_rows(filter_tasks(Tasks.objects.all(), request)), export.TASK_COLUMNS
+        content = export.stream_csv(rows, columns) if fmt == 'csv' else export.stream_jsonl(rows)
+        if isinstance(request._request, ASGIRequest):
+            content = export.aiter_chunks(content)
+
+        response = StreamingHttpResponse(content, content_type=self.CONTENT_TYPES[fmt])
+        response['Content-Disposition'] = f'attachment; filename="{kind}.{fmt}"'
+        return response
+
+
+class MetricsView(APIView):
+    """
+    API представление метрик запросов по эндпоинтам (данные текущего процесса).
+    Доступно только для администраторов (access_level >= 3).
+    
+    Методы:
+        get: Сводка по эндпоинтам (количество, статусы, p50/p95/p99 времени, SQL-запросов,
+            сериализации, рендеринга и размера ответа), отсортированная по суммарному времени
+        delete: Сброс накопленных метрик
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return Response({'sample_rate': metrics.SAMPLE_RATE, 'endpoints': metrics.registry.report()})
+
+    def delete(self, request):
+        metrics.registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class PrometheusMetricsView(APIView):
+    """
+    Метрики в текстовом формате Prometheus.
+    Доступно только для администраторов (access_level >= 3).
+    
+    Методы:
+        get: Счетчик запросов и гистограммы по эндпоинтам
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return HttpResponse(metrics.registry.prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class TaskListCreateView(CursorPaginationMixin, APIView):
     """
     API представление для работы со списком задач.
     
     Методы:
-        get: Получение списка всех задач
+        get: Получение постраничного списка задач с фильтрацией
+            (event_id, user_id, creator, status, deadline_from, deadline_to,
+            is_past, overdue) и сортировкой (?ordering=deadline,-status);
+            компактно, ?fields=id,task, ?expand=description
         post: Создание новой задачи
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        event_id = request.query_params.get('event_id')
-        user_id = request.query_params.get('user_id')
-        
-        tasks = Tasks.objects.all()
-        
-        if event_id:
-            tasks = tasks.filter(event_id=event_id)
-        if user_id:
-            tasks = tasks.filter(executor=user_id)
-        
-        serializer = TasksSerializer(tasks, many=True)
-        return Response(serializer.data)
+        options = get_field_options(request, compact=True)
+        fields = TasksSerializer(**options)
+        tasks = Tasks.objects.for_api(fields.get_sources())
+        tasks = tasks.only(*fields.get_only_fields(extra=['deadline', 'status', 'event', 'creator']))
+        tasks = filter_tasks(tasks, request)
+        tasks, self.ordering = order_tasks(tasks, request)
+
+        rows = fields.values_queryset(tasks, extra=self.ordering_fields)
+        if rows is not None:
+            return self.get_paginated_response(fields.values_data(self.paginate_queryset(rows)))
+        tasks = self.paginate_queryset(tasks)
+        serializer = TasksSerializer(tasks, many=True, **options)
+        return self.get_paginated_response(metrics.serializer_data(serializer))
 
     def post(self, request):
         serializer = TasksSerializer(
@@ -332,6 +557,69 @@ class TaskListCreateView(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class TaskBulkView(APIView):
+    """
+    API представление для массовой работы с задачами.
+    Все изменения выполняются в одной транзакции: при ошибке в любом элементе
+    ничего не сохраняется, а ответ содержит ошибки по каждому элементу.
+    
+    Методы:
+        post: Создание нескольких задач
+            Параметры:
+                tasks: Список задач в формате TasksSerializer
+        put: Частичное обновление нескольких задач
+            Параметры:
+                tasks: Список объектов с обязательным полем id
+        delete: Удаление нескольких задач
+            Параметры:
+                ids: Список ID задач
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_items(self, request):
+        tasks = request.data.get('tasks')
+        if not isinstance(tasks, list) or not tasks:
+            return None
+        return tasks
+
+    def save(self, serializer, success_status):
+        with transaction.atomic():
+            if not serializer.is_valid():
+                return Response({'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+            tasks = serializer.save()
+        return Response(TasksSerializer(tasks, many=True).data, status=success_status)
+
+    def post(self, request):
+        items = self.get_items(request)
+        if items is None:
+            return Response({"error": "tasks must be a non-empty list."}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = TasksSerializer(data=items, many=True, context={'request': request})
+        return self.save(serializer, status.HTTP_201_CREATED)
+
+    def put(self, request):
+        items = self.get_items(request)
+        if items is None or not all(isinstance(item, dict) and isinstance(item.get('id'), int) for item in items):
+            return Response({"error": "tasks must be a non-empty list of objects with integer id."}, status=status.HTTP_400_BAD_REQUEST)
+        ids = [item['id'] for item in items]
+        if len(set(ids)) != len(ids):
+            return Response({"error": "Task ids must be unique."}, status=status.HTTP_400_BAD_REQUEST)
+
+        instances = Tasks.objects.for_api().in_bulk(ids)
+        serializer = TasksSerializer(instances, data=items, many=True, partial=True, context={'request': request})
+        return self.save(serializer, status.HTTP_200_OK)
+
+    def delete(self, request):
+        ids = request.data.get('ids')
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, int) for i in ids):
+            return Response({"error": "ids must be a non-empty list of integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            tasks = Tasks.objects.filter(pk__in=ids)
+            found = set(tasks.values_list('id', flat=True))
+            tasks.delete()
+        results = [{'id': task_id, 'status': 'deleted' if task_id in found else 'not_found'} for task_id in ids]
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
 class TaskDetailView(APIView):
     """
     API представление для работы с отдельной задачей.
@@ -349,7 +637,7 @@ class TaskDetailView(APIView):
     def get(self, request, task_id):
         task = self.get_object(task_id)
         serializer = TasksSerializer(task)
-        return Response(serializer.data)
+        return Response(metrics.serializer_data(serializer))
 
     def put(self, request, task_id):
         task = self.get_object(task_id)